@@ -0,0 +1,149 @@
+"""
+Micro-benchmark da extração de valores e datas (regexes antigas x motor de tokens)
+
+Uso:
+    python -m benchmarks.bench_extracao [texto.txt ...]
+
+Sem argumentos, usa os textos de PDF já extraídos e guardados no
+DocumentStore (Config.DOCUMENT_STORE_DIR).
+"""
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import List, Tuple
+
+from config.config import Config
+from core import motor_extracao
+
+REPETICOES = 5
+
+
+# Implementação anterior, mantida aqui só como referência de desempenho
+def valores_antigo(texto: str) -> dict:
+    valores = {'valor_total': None, 'valor_por_projeto': None, 'quantidade_projetos': None, 'contrapartida': None}
+
+    padroes_valor = [
+        r'R\$\s*([\d.,]+(?:\.\d{3})*(?:,\d{2})?)',
+        r'valor\s+total[:\s]+R\$\s*([\d.,]+)',
+        r'recursos?\s+de\s+R\$\s*([\d.,]+)',
+        r'montante\s+de\s+R\$\s*([\d.,]+)'
+    ]
+    for padrao in padroes_valor:
+        for match in re.finditer(padrao, texto, re.IGNORECASE):
+            try:
+                valor = float(match.group(1).replace('.', '').replace(',', '.'))
+            except ValueError:
+                continue
+            if not valores['valor_total'] or valor > valores['valor_total']:
+                valores['valor_total'] = valor
+
+    match_projetos = re.search(r'até\s+(\d+)\s+projetos?', texto, re.IGNORECASE)
+    if match_projetos:
+        valores['quantidade_projetos'] = int(match_projetos.group(1))
+
+    if re.search(r'contrapartida', texto, re.IGNORECASE):
+        match = re.search(r'contrapartida[^\d]*([\d.,]+\s*%|R\$\s*[\d.,]+)', texto, re.IGNORECASE)
+        if match:
+            valores['contrapartida'] = match.group(1)
+
+    return valores
+
+
+def datas_antigo(texto: str) -> dict:
+    datas = {'inscricoes_inicio': None, 'inscricoes_fim': None,
+             'resultado_preliminar': None, 'resultado_final': None}
+
+    texto_cronograma = ""
+    for padrao in [r'cronograma.*?(?=\n\n|\Z)', r'calendário.*?(?=\n\n|\Z)', r'prazo.*?(?=\n\n|\Z)']:
+        match = re.search(padrao, texto, re.IGNORECASE | re.DOTALL)
+        if match:
+            texto_cronograma += match.group(0) + "\n"
+
+    alvo = texto_cronograma or texto
+    match = re.search(r'inscrições?[^\d]*([\d/]+)\s+(?:a|até|e)\s+([\d/]+)', alvo, re.IGNORECASE)
+    if match:
+        datas['inscricoes_inicio'], datas['inscricoes_fim'] = match.group(1), match.group(2)
+
+    match = re.search(r'resultado\s+(?:preliminar|parcial)[^\d]*([\d/]+)', alvo, re.IGNORECASE)
+    if match:
+        datas['resultado_preliminar'] = match.group(1)
+
+    match = re.search(r'resultado\s+final[^\d]*([\d/]+)', alvo, re.IGNORECASE)
+    if match:
+        datas['resultado_final'] = match.group(1)
+
+    return datas
+
+
+def extrair_antigo(texto: str):
+    return valores_antigo(texto), datas_antigo(texto)
+
+
+def extrair_novo(texto: str):
+    tokens = motor_extracao.tokenizar(texto)
+    return motor_extracao.extrair_valores(tokens, texto), motor_extracao.extrair_datas(tokens, texto)
+
+
+def carregar_textos_salvos(diretorio: str) -> List[Tuple[str, str]]:
+    indice = os.path.join(diretorio, 'indice.sqlite')
+    if not os.path.exists(indice):
+        return []
+
+    conn = sqlite3.connect(indice)
+    linhas = conn.execute("SELECT hash, dados FROM resultados WHERE tipo = 'texto'").fetchall()
+    conn.close()
+
+    return [(hash_pdf[:16], json.loads(dados)['texto']) for hash_pdf, dados in linhas]
+
+
+def medir(funcao) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        funcao()
+    return (time.perf_counter() - inicio) / REPETICOES * 1000
+
+
+def main():
+    if len(sys.argv) > 1:
+        textos = []
+        for caminho in sys.argv[1:]:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                textos.append((caminho, f.read()))
+    else:
+        textos = carregar_textos_salvos(Config.DOCUMENT_STORE_DIR)
+
+    textos = [(nome, texto) for nome, texto in textos if texto]
+    if not textos:
+        print("Nenhum texto encontrado. Processe alguns PDFs ou passe arquivos .txt.")
+        return
+
+    print(f"{'documento':40} {'KB':>7} {'antes ms':>9} {'depois ms':>9} {'ganho':>6}")
+
+    total_antes = total_depois = 0.0
+    divergencias = 0
+
+    for nome, texto in textos:
+        antigo, novo = extrair_antigo(texto), extrair_novo(texto)
+        for campo, valor in {**antigo[0], **antigo[1]}.items():
+            obtido = novo[0].get(campo, novo[1].get(campo))
+            if valor != obtido:
+                divergencias += 1
+                print(f"  {nome[-40:]}: {campo} {valor!r} -> {obtido!r}")
+
+        antes = medir(lambda: extrair_antigo(texto))
+        depois = medir(lambda: extrair_novo(texto))
+        total_antes += antes
+        total_depois += depois
+
+        print(f"{nome[-40:]:40} {len(texto) / 1024:7.1f} {antes:9.2f} {depois:9.2f} {antes / depois:5.1f}x")
+
+    n = len(textos)
+    print(f"\nMédia por documento: {total_antes / n:.2f} ms -> {total_depois / n:.2f} ms "
+          f"({total_antes / total_depois:.1f}x), {divergencias} campos diferentes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark do parsing HTML (html.parser completo x lxml + SoupStrainer)
+
+Uso:
+    python -m benchmarks.bench_html_parsing [pagina.html ...]
+
+Sem argumentos, usa as páginas HTML salvas pelo GET condicional em
+Config.HTTP_CACHE_DIR.
+"""
+import glob
+import json
+import os
+import sys
+import time
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup
+
+from config.config import Config
+from utils.html_parser import FILTRO_EDITAL, FILTRO_LISTA, PARSER_PADRAO, PARSER_RAPIDO, parse_html
+
+REPETICOES = 5
+
+
+def carregar_paginas_salvas(cache_dir: str) -> List[Tuple[str, bytes]]:
+    paginas = []
+
+    for arquivo_meta in sorted(glob.glob(os.path.join(cache_dir, '*.json'))):
+        with open(arquivo_meta, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        tipo = {k.lower(): v for k, v in meta.get('headers', {}).items()}.get('content-type', '')
+        if 'html' not in tipo:
+            continue
+
+        with open(arquivo_meta[:-len('.json')] + '.body', 'rb') as f:
+            paginas.append((meta['url'], f.read()))
+
+    return paginas
+
+
+def extrair(soup: BeautifulSoup, eh_lista: bool) -> int:
+    """Mesma consulta que o scraper faz sobre a árvore"""
+    if eh_lista:
+        return len(soup.find_all('article', class_='tease'))
+
+    secao = soup.find('section', class_='entry-content')
+    return len(secao.find_all('a')) if secao else 0
+
+
+def medir(funcao) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        funcao()
+    return (time.perf_counter() - inicio) / REPETICOES * 1000
+
+
+def main():
+    if len(sys.argv) > 1:
+        paginas = []
+        for caminho in sys.argv[1:]:
+            with open(caminho, 'rb') as f:
+                paginas.append((caminho, f.read()))
+    else:
+        paginas = carregar_paginas_salvas(Config.HTTP_CACHE_DIR)
+
+    if not paginas:
+        print("Nenhuma página HTML encontrada. Rode o scraper uma vez ou passe arquivos .html.")
+        return
+
+    print(f"Parser rápido: {PARSER_RAPIDO} + SoupStrainer | padrão: {PARSER_PADRAO}\n")
+    print(f"{'página':60} {'KB':>7} {'antes ms':>9} {'depois ms':>9} {'ganho':>6}")
+
+    total_antes = total_depois = 0.0
+
+    for nome, html in paginas:
+        eh_lista = b'tease' in html
+        filtro = FILTRO_LISTA if eh_lista else FILTRO_EDITAL
+
+        esperado = extrair(BeautifulSoup(html, PARSER_PADRAO), eh_lista)
+        obtido = extrair(parse_html(html, filtro), eh_lista)
+        if esperado != obtido:
+            print(f"  DIVERGÊNCIA em {nome}: {esperado} x {obtido}")
+
+        antes = medir(lambda: extrair(BeautifulSoup(html, PARSER_PADRAO), eh_lista))
+        depois = medir(lambda: extrair(parse_html(html, filtro), eh_lista))
+        total_antes += antes
+        total_depois += depois
+
+        print(f"{nome[-60:]:60} {len(html) / 1024:7.1f} {antes:9.2f} {depois:9.2f} {antes / depois:5.1f}x")
+
+    n = len(paginas)
+    print(f"\nMédia por página: {total_antes / n:.2f} ms -> {total_depois / n:.2f} ms "
+          f"({total_antes / total_depois:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark dos backends de texto de PDF (core.pdf_backends)
+
+Uso:
+    python -m benchmarks.bench_pdf_backends [arquivo.pdf ...] [--referencia NOME] [--salvar]
+
+Sem arquivos, usa os PDFs guardados no DocumentStore
+(Config.DOCUMENT_STORE_DIR). Para cada backend instalado mede páginas por
+segundo e a fidelidade do texto: F1 das palavras contra um texto de
+referência, que é o arquivo.txt ao lado do PDF, se existir, ou o texto do
+backend de referência (padrão: pdfminer, o de layout mais completo).
+
+Com --salvar, grava em Config.PDF_BACKEND_RANKING os backends com
+fidelidade >= FIDELIDADE_MINIMA, do mais rápido ao mais lento; é esse
+ranking que Config.PDF_BACKEND = 'auto' segue.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+from config.config import Config
+from core.pdf_backends import BACKENDS, backends_disponiveis
+
+FIDELIDADE_MINIMA = 0.9
+PADRAO_PALAVRA = re.compile(r'\w+')
+
+
+def palavras(texto: str) -> Counter:
+    return Counter(PADRAO_PALAVRA.findall(texto.lower()))
+
+
+def fidelidade(texto: str, referencia: str) -> float:
+    """F1 das palavras (multiconjunto) do texto contra a referência"""
+    obtidas, esperadas = palavras(texto), palavras(referencia)
+    if not obtidas and not esperadas:
+        return 1.0
+
+    comuns = sum((obtidas & esperadas).values())
+    if not comuns:
+        return 0.0
+
+    precisao = comuns / sum(obtidas.values())
+    revocacao = comuns / sum(esperadas.values())
+    return 2 * precisao * revocacao / (precisao + revocacao)
+
+
+def extrair(nome: str, caminho: str) -> Dict:
+    inicio = time.perf_counter()
+    try:
+        paginas = list(BACKENDS[nome].paginas(caminho))
+        erro = None
+    except Exception as e:
+        paginas, erro = [], str(e)
+
+    return {
+        'segundos': time.perf_counter() - inicio,
+        'paginas': len(paginas),
+        'texto': '\n'.join(paginas),
+        'erro': erro
+    }
+
+
+def texto_referencia(caminho: str, extracoes: Dict[str, Dict], referencia: str) -> Optional[str]:
+    gabarito = os.path.splitext(caminho)[0] + '.txt'
+    if os.path.exists(gabarito):
+        with open(gabarito, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    if referencia in extracoes and not extracoes[referencia]['erro']:
+        return extracoes[referencia]['texto']
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de texto de PDF")
+    parser.add_argument('arquivos', nargs='*', help="PDFs (padrão: os do DocumentStore)")
+    parser.add_argument('--referencia', default='pdfminer', help="backend usado como referência de fidelidade")
+    parser.add_argument('--salvar', action='store_true', help="grava o ranking em Config.PDF_BACKEND_RANKING")
+    args = parser.parse_args()
+
+    arquivos = args.arquivos or sorted(glob.glob(os.path.join(Config.DOCUMENT_STORE_DIR, '*', '*.pdf')))
+    if not arquivos:
+        print("Nenhum PDF encontrado. Processe alguns editais ou passe arquivos .pdf.")
+        return
+
+    nomes = backends_disponiveis()
+    if not nomes:
+        print("Nenhum backend de PDF instalado.")
+        return
+
+    referencia = args.referencia if args.referencia in nomes else nomes[0]
+    print(f"Backends: {', '.join(nomes)} | referência: {referencia} (ou arquivo.txt ao lado do PDF)\n")
+
+    totais = {nome: {'segundos': 0.0, 'paginas': 0, 'fidelidades': [], 'erros': 0} for nome in nomes}
+
+    for caminho in arquivos:
+        extracoes = {nome: extrair(nome, caminho) for nome in nomes}
+        gabarito = texto_referencia(caminho, extracoes, referencia)
+
+        print(os.path.basename(caminho)[-60:])
+        for nome, extracao in extracoes.items():
+            total = totais[nome]
+            if extracao['erro']:
+                total['erros'] += 1
+                print(f"  {nome:10} ERRO: {extracao['erro']}")
+                continue
+
+            total['segundos'] += extracao['segundos']
+            total['paginas'] += extracao['paginas']
+            nota = fidelidade(extracao['texto'], gabarito) if gabarito is not None else None
+            if nota is not None:
+                total['fidelidades'].append(nota)
+
+            velocidade = extracao['paginas'] / extracao['segundos'] if extracao['segundos'] else 0
+            print(f"  {nome:10} {extracao['paginas']:4d} pág {velocidade:8.1f} pág/s "
+                  f"fidelidade {'-' if nota is None else f'{nota:.3f}'}")
+
+    print(f"\n{'backend':10} {'pág/s':>8} {'fidelidade':>10} {'erros':>6}")
+    resumo = []
+    for nome, total in totais.items():
+        velocidade = total['paginas'] / total['segundos'] if total['segundos'] else 0
+        media = sum(total['fidelidades']) / len(total['fidelidades']) if total['fidelidades'] else None
+        resumo.append({'backend': nome, 'paginas_por_segundo': velocidade, 'fidelidade': media,
+                       'erros': total['erros']})
+        print(f"{nome:10} {velocidade:8.1f} {'-' if media is None else f'{media:10.3f}':>10} {total['erros']:6d}")
+
+    ranking = [
+        item['backend'] for item in sorted(resumo, key=lambda item: -item['paginas_por_segundo'])
+        if not item['erros'] and (item['fidelidade'] is None or item['fidelidade'] >= FIDELIDADE_MINIMA)
+    ]
+    print(f"\nRanking (fidelidade >= {FIDELIDADE_MINIMA}): {' > '.join(ranking) or '-'}")
+
+    if args.salvar and ranking:
+        with open(Config.PDF_BACKEND_RANKING, 'w', encoding='utf-8') as f:
+            json.dump({
+                'ranking': ranking,
+                'medicoes': resumo,
+                'arquivos': len(arquivos),
+                'medido_em': datetime.now().isoformat()
+            }, f, ensure_ascii=False, indent=2)
+        print(f"Ranking salvo em {Config.PDF_BACKEND_RANKING}")
+
+
+if __name__ == '__main__':
+    main()
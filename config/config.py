@@ -8,23 +8,69 @@ class Config:
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     CACHE_DIR = os.path.join(BASE_DIR, 'cache_resultados')
     STRUCTURE_CACHE_DIR = os.path.join(BASE_DIR, 'cache_estrutura')
+    HTTP_CACHE_DIR = os.path.join(BASE_DIR, 'cache_http')
+    CRAWL_STATE_FILE = os.path.join(BASE_DIR, 'estado_coleta.json')
+    HTTP_ARCHIVE_FILE = os.path.join(BASE_DIR, 'arquivo_http.sqlite')
+    FEED_STATE_FILE = os.path.join(BASE_DIR, 'estado_feed.json')
+    DOCUMENT_STORE_DIR = os.path.join(BASE_DIR, 'documentos')
+    PDF_BACKEND_RANKING = os.path.join(BASE_DIR, 'pdf_backends.json')
+    OCR_CACHE_FILE = os.path.join(BASE_DIR, 'cache_ocr.sqlite')
 
     # URLs
     FAPEG_BASE_URL = "https://goias.gov.br/fapeg"
     FAPEG_EDITAIS_URL = "https://goias.gov.br/fapeg/categoria/editais/"
+    FAPEG_FEED_URL = "https://goias.gov.br/fapeg/categoria/editais/feed/"
+    FAPEG_WP_API_URL = "https://goias.gov.br/fapeg/wp-json/wp/v2"
+    FAPEG_CATEGORIA_SLUG = 'editais'
+    FUSO_HORARIO_SITE = -3  # horas em relação ao UTC (Brasília, sem horário de verão desde 2019)
 
     # Cache
     CACHE_TTL_HOURS = 24
     USE_CACHE = True
+    USE_CONDITIONAL_GET = True  # ETag / Last-Modified em páginas e PDFs
+    USE_DOCUMENT_STORE = True  # PDFs e resultados por SHA-256 do conteúdo
 
     # Scraping
-    REQUEST_TIMEOUT = 30
-    DELAY_BETWEEN_REQUESTS = 1  # segundos
+    REQUEST_TIMEOUT = 30  # leitura, segundos
+    CONNECT_TIMEOUT = 10
+    DELAY_BETWEEN_REQUESTS = 1  # segundos (intervalo inicial do rate limiter)
+    RATE_LIMIT_MINIMO = 0.2  # requisições/segundo por host
+    RATE_LIMIT_MAXIMO = 4.0
+    RATE_LIMIT_RAJADA = 2  # tokens acumuláveis
     MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.5  # segundos, dobra a cada tentativa
+    RETRY_JITTER = 0.5
+    HTTP_POOL_CONEXOES = 4  # hosts distintos mantidos no pool
+    HTTP_POOL_MAXSIZE = 10  # conexões keep-alive por host
+    HTTP_ARCHIVE_MODE = None  # None, 'gravar' ou 'reproduzir' (offline)
+    MAX_WORKERS = 4  # threads para páginas de detalhes
+    MAX_CONEXOES_POR_HOST = 4  # requisições simultâneas por host (páginas, API, feed e PDFs)
+    MAX_PAGINAS = 3  # None = todas (só com LISTAGEM_PARALELA)
+    LISTAGEM_PARALELA = False  # lê o total de páginas na página 1 e baixa o resto em paralelo
+    COLETA_INCREMENTAL = True  # para ao encontrar uma página sem novidades
+    PDF_WORKERS = 2  # downloads de PDF simultâneos, em paralelo à coleta
+    PDF_PROCESSOS = os.cpu_count() or 2  # processos de extração de texto/regex
+    PDF_TIMEOUT = 120  # segundos por PDF na extração
+    PDF_BACKEND = 'auto'  # pypdfium2, pypdf, PyPDF2, pdfminer; auto = o mais rápido instalado
+    PDF_ORCAMENTO_CPU = 30  # segundos de CPU por PDF; além disso, páginas e etapas restantes são puladas
+    HTML_PARSER_RAPIDO = True  # lxml + SoupStrainer; False = html.parser completo
+    DOWNLOAD_MAX_MB = 100  # PDFs maiores são recusados (Content-Length) ou interrompidos
+    DOWNLOAD_CHUNK_BYTES = 64 * 1024
+    DOWNLOAD_DIR = None  # downloads temporários; None = diretório temporário do sistema
+    COLETA_VIA_API = True  # API REST do WordPress; cai para o scraping HTML se falhar
+    WP_API_MAX_PAGINAS = 1  # páginas de 100 posts
 
     # OCR
     USE_OCR = True
     TESSERACT_CMD = None
+    OCR_WORKERS = os.cpu_count() or 2  # páginas em OCR ao mesmo tempo (teto de tesseracts somando todos os PDFs)
+    OCR_DPI = 300  # DPI máximo (o único, sem OCR_ADAPTATIVO)
+    OCR_ADAPTATIVO = True  # lê em OCR_DPI_INICIAL e só relê em OCR_DPI as páginas de baixa confiança
+    OCR_DPI_INICIAL = 200
+    OCR_CONFIANCA_MINIMA = 70  # média da confiança (0-100) das palavras no image_to_data
+    OCR_JANELA_PAGINAS = 4  # páginas rasterizadas por chamada ao pdftoppm (pico de memória/disco do OCR)
+    OCR_MIN_CARACTERES_PAGINA = 50  # abaixo disso, página com imagem vai para o OCR
+    USE_OCR_CACHE = True  # texto de OCR por página (SHA-256 da imagem + idioma, psm e DPI)
 
     # Database
     DB_CONFIG = {
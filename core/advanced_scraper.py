@@ -344,32 +344,26 @@ class DatabaseQueries:
 # Scraper avançado com OCR e monitoramento
 # ============================================================================
 
-import requests
 from bs4 import BeautifulSoup
+import os
+import tempfile
 import time
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 from urllib.parse import urljoin
 
 # Imports de outros módulos do projeto
 from config.config import Config
+from core.ocr import (
+    OCR_AVAILABLE, OCR_CONFIG, OCR_LANG, ResultadoOCR, configurar_tesseract, contar_paginas, obter_pool_ocr,
+    pagina_precisa_ocr, rasterizar_paginas, tentar_ocr_pagina
+)
+from core.pdf_backends import PaginaPDF, obter_backend
 from utils.cache import ResultCache
-from utils.structure_monitor import StructureMonitor
-
-try:
-    import pytesseract
-    from pdf2image import convert_from_bytes
-    from PIL import Image, ImageEnhance
-
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
-
-try:
-    import PyPDF2
-
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+from utils.document_store import obter_document_store, sha256_arquivo
+from utils.http_client import HTTPClient, obter_cliente_http
+from utils.html_parser import parse_html
+from utils.ocr_cache import obter_cache_ocr
+from utils.structure_monitor import FILTRO_ESTRUTURA, StructureMonitor
 
 
 class AdvancedPDFExtractor:
@@ -377,92 +371,219 @@ class AdvancedPDFExtractor:
 
     def __init__(self, config: Config):
         self.config = config
+        self.backend = obter_backend(config.PDF_BACKEND, config.PDF_BACKEND_RANKING)
 
         if config.USE_OCR and not OCR_AVAILABLE:
             print("AVISO: OCR solicitado mas bibliotecas não instaladas")
             print("Instale: pip install pytesseract pdf2image pillow")
 
-        if config.USE_OCR and config.TESSERACT_CMD:
-            pytesseract.pytesseract.tesseract_cmd = config.TESSERACT_CMD
+        if config.USE_OCR:
+            configurar_tesseract(config.TESSERACT_CMD)
 
-    def extrair_texto(self, pdf_bytes: bytes) -> str:
-        """Extrai texto do PDF, usando OCR se necessário"""
+        # Texto de OCR por página rasterizada (SHA-256 da imagem + parâmetros)
+        self.cache_ocr = obter_cache_ocr(config) if config.USE_OCR and config.USE_OCR_CACHE else None
 
-        # Tentar extração normal primeiro
-        texto = self._extrair_texto_normal(pdf_bytes)
-
-        # Se extraiu pouco texto, tentar OCR
-        if len(texto.strip()) < 100 and self.config.USE_OCR and OCR_AVAILABLE:
-            print("  Usando OCR...")
-            texto = self._extrair_texto_ocr(pdf_bytes)
+    def extrair_texto(self, pdf: Union[str, bytes]) -> str:
+        """
+        Extrai texto do PDF, usando OCR nas páginas que precisam
 
-        return texto
+        Args:
+            pdf: caminho do arquivo baixado (lido via mmap) ou bytes
+        """
+        return self.extrair(pdf)['texto']
 
-    def _extrair_texto_normal(self, pdf_bytes: bytes) -> str:
-        """Extração normal de PDF"""
-        if not PDF_AVAILABLE:
-            return ""
+    def extrair(self, pdf: Union[str, bytes]) -> Dict:
+        """
+        Texto do PDF, com a decisão de OCR tomada página a página
 
-        try:
-            import io
-            pdf_file = io.BytesIO(pdf_bytes)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+        Páginas digitais ficam com a camada de texto (barata); só as
+        digitalizadas ou com texto ilegível (ver pagina_precisa_ocr) são
+        rasterizadas e passam pelo OCR. Se a camada de texto não puder ser
+        lida, o documento inteiro vai para o OCR.
 
-            texto = ""
-            for page in pdf_reader.pages:
-                texto += page.extract_text() + "\n"
+        Returns:
+            texto, total de páginas, números das páginas lidas por OCR e,
+            para cada uma, o DPI usado e a confiança média do tesseract
+        """
+        usar_ocr = self.config.USE_OCR and OCR_AVAILABLE
+        paginas = self._extrair_paginas_normal(pdf)
+
+        if paginas is None:
+            lidas = self._extrair_texto_ocr(pdf) if usar_ocr else []
+            textos = [lida.texto for lida in lidas]
+            paginas_ocr = list(range(1, len(lidas) + 1))
+        else:
+            textos = [pagina.texto for pagina in paginas]
+            paginas_ocr = [
+                numero for numero, pagina in enumerate(paginas, 1)
+                if pagina_precisa_ocr(pagina, self.config.OCR_MIN_CARACTERES_PAGINA)
+            ] if usar_ocr else []
+
+            lidas = []
+            if paginas_ocr:
+                print(f"  Usando OCR em {len(paginas_ocr)} de {len(paginas)} páginas...")
+                lidas = self._extrair_texto_ocr(pdf, paginas_ocr)
+                for numero, lida in zip(paginas_ocr, lidas):
+                    # OCR vazio (erro ou página sem texto): fica a camada de texto
+                    if lida.texto.strip():
+                        textos[numero - 1] = lida.texto
+                paginas_ocr = paginas_ocr[:len(lidas)]
 
-            return texto
-        except Exception as e:
-            print(f"  Erro na extração normal: {e}")
-            return ""
+        return {
+            'texto': "\n".join(textos),
+            'paginas': len(textos),
+            'paginas_ocr': paginas_ocr,
+            'ocr': [
+                {
+                    'pagina': numero,
+                    'dpi': lida.dpi,
+                    'confianca': round(lida.confianca, 1) if lida.confianca is not None else None
+                }
+                for numero, lida in zip(paginas_ocr, lidas)
+            ]
+        }
 
-    def _extrair_texto_ocr(self, pdf_bytes: bytes) -> str:
-        """Extração com OCR"""
-        if not OCR_AVAILABLE:
-            return ""
+    def _extrair_paginas_normal(self, pdf: Union[str, bytes]) -> Optional[List[PaginaPDF]]:
+        """Camada de texto de cada página; None se o PDF não puder ser lido"""
+        if not self.backend:
+            return None
 
         try:
-            # Converter PDF para imagens
-            imagens = convert_from_bytes(pdf_bytes, dpi=300)
-
-            texto_completo = ""
+            return list(self.backend.analisar_paginas(pdf))
+        except Exception as e:
+            print(f"  Erro na extração normal ({self.backend.nome}): {e}")
+            return None
 
-            for i, imagem in enumerate(imagens, 1):
-                print(f"    Página {i}/{len(imagens)}...")
+    def _extrair_texto_ocr(self, pdf: Union[str, bytes], numeros: Optional[List[int]] = None) -> List[ResultadoOCR]:
+        """
+        Extração com OCR
 
-                # Pré-processar imagem
-                imagem = self._preprocessar_imagem(imagem)
+        Com Config.OCR_ADAPTATIVO, todas as páginas são lidas primeiro em
+        OCR_DPI_INICIAL (menos pixels, tesseract bem mais rápido) e só as de
+        confiança média abaixo de OCR_CONFIANCA_MINIMA são rasterizadas de
+        novo e relidas em OCR_DPI. Fica a leitura de maior confiança.
 
-                # OCR
-                texto = pytesseract.image_to_string(
-                    imagem,
-                    lang='por',
-                    config='--psm 6'
-                )
+        Args:
+            numeros: páginas a ler (a partir de 1, em ordem); None para todas
 
-                texto_completo += texto + "\n\n"
+        Returns:
+            texto, confiança e DPI de cada página pedida; vazio se o OCR falhar
+        """
+        if not OCR_AVAILABLE:
+            return []
 
-            return texto_completo
+        try:
+            with tempfile.TemporaryDirectory(prefix='ocr_') as pasta:
+                if isinstance(pdf, bytes):
+                    caminho = os.path.join(pasta, 'documento.pdf')
+                    with open(caminho, 'wb') as f:
+                        f.write(pdf)
+                else:
+                    caminho = pdf
+
+                if numeros is None:
+                    numeros = list(range(1, contar_paginas(caminho) + 1))
+
+                adaptativo = self.config.OCR_ADAPTATIVO and self.config.OCR_DPI_INICIAL < self.config.OCR_DPI
+                dpi = self.config.OCR_DPI_INICIAL if adaptativo else self.config.OCR_DPI
+                resultados = self._ocr_passada(caminho, pasta, numeros, dpi)
+
+                if adaptativo:
+                    minimo = self.config.OCR_CONFIANCA_MINIMA
+                    # Página sem nenhuma palavra (em branco) não é relida
+                    baixas = [
+                        i for i, resultado in enumerate(resultados)
+                        if resultado.confianca is not None and resultado.confianca < minimo
+                    ]
+                    if baixas:
+                        print(f"    {len(baixas)} páginas com confiança < {minimo} a {dpi} dpi, "
+                              f"relendo a {self.config.OCR_DPI} dpi...")
+                        refeitas = self._ocr_passada(
+                            caminho, pasta, [numeros[i] for i in baixas], self.config.OCR_DPI
+                        )
+                        for i, refeita in zip(baixas, refeitas):
+                            anterior = resultados[i]
+                            if refeita.texto.strip() and (refeita.confianca or 0) >= anterior.confianca:
+                                resultados[i] = refeita
+
+            return resultados
 
         except Exception as e:
             print(f"  Erro no OCR: {e}")
-            return ""
-
-    def _preprocessar_imagem(self, imagem: Image.Image) -> Image.Image:
-        """Melhora qualidade da imagem para OCR"""
-        # Escala de cinza
-        imagem = imagem.convert('L')
-
-        # Aumentar contraste
-        enhancer = ImageEnhance.Contrast(imagem)
-        imagem = enhancer.enhance(2)
+            return []
+
+    def _ocr_passada(self, caminho: str, pasta: str, numeros: List[int], dpi: int) -> List[ResultadoOCR]:
+        """OCR das páginas `numeros` rasterizadas em `dpi`, com o cache de OCR"""
+        # Páginas rasterizadas em disco, uma janela por vez, e apagadas
+        # assim que lidas: a memória (e o disco) usados não crescem
+        # com o número de páginas do PDF
+        total = len(numeros)
+        paginas = rasterizar_paginas(caminho, pasta, dpi, self.config.OCR_JANELA_PAGINAS, numeros)
+
+        # Páginas já lidas antes (mesma imagem) vêm do cache; só as
+        # demais chegam ao tesseract
+        resultados: List[Optional[ResultadoOCR]] = [None] * total
+        chaves: List[Optional[str]] = [None] * total
+        if self.cache_ocr:
+            faltantes: List[int] = []
+            paginas = self._consultar_cache_ocr(paginas, dpi, resultados, chaves, faltantes)
+        else:
+            faltantes = list(range(total))
+
+        # Número de cada página no PDF, para as mensagens; o índice em
+        # `faltantes` já foi anotado quando a página é gerada
+        numeradas = ((numeros[faltantes[i]], imagem) for i, imagem in enumerate(paginas))
+
+        # Páginas em paralelo no pool de OCR compartilhado (ver core.ocr);
+        # com um worker só, na thread atual
+        if self.config.OCR_WORKERS > 1 and total > 1:
+            print(f"    OCR de {total} páginas a {dpi} dpi ({self.config.OCR_WORKERS} processos)...")
+            lidos = obter_pool_ocr(self.config).ocr_paginas(numeradas, apagar=True)
+        else:
+            lidos = []
+            for numero, imagem in numeradas:
+                print(f"    Página {numero} a {dpi} dpi...")
+                # Como no pool: erro numa página não descarta as outras
+                lidos.append(tentar_ocr_pagina(imagem, numero))
+                os.remove(imagem)
+
+        for indice, lido in zip(faltantes, lidos):
+            resultados[indice] = lido._replace(dpi=dpi)
+            # Erros não ficam no cache; páginas em branco lidas sem erro, sim
+            if self.cache_ocr and not lido.falhou:
+                self.cache_ocr.salvar(chaves[indice], lido.texto, lido.confianca)
+
+        if self.cache_ocr and len(faltantes) < total:
+            print(f"    {total - len(faltantes)} de {total} páginas do cache de OCR")
+
+        return resultados
+
+    def _consultar_cache_ocr(
+            self,
+            paginas: Iterable[str],
+            dpi: int,
+            resultados: List[Optional[ResultadoOCR]],
+            chaves: List[Optional[str]],
+            faltantes: List[int]
+    ) -> Iterator[str]:
+        """
+        Gera só as páginas sem texto no cache de OCR
 
-        # Aumentar nitidez
-        enhancer = ImageEnhance.Sharpness(imagem)
-        imagem = enhancer.enhance(1.5)
+        As encontradas vão direto para `resultados` (e a imagem é apagada);
+        as demais são geradas para o OCR, com o índice anotado em
+        `faltantes` e a chave em `chaves`, para salvar o resultado depois.
+        """
+        for indice, caminho in enumerate(paginas):
+            chave = self.cache_ocr.chave(sha256_arquivo(caminho), OCR_LANG, OCR_CONFIG, dpi)
+            encontrado = self.cache_ocr.obter(chave)
+            if encontrado is not None:
+                resultados[indice] = ResultadoOCR(*encontrado, dpi)
+                os.remove(caminho)
+                continue
 
-        return imagem
+            chaves[indice] = chave
+            faltantes.append(indice)
+            yield caminho
 
 
 class AdvancedFAPEGScraper:
@@ -474,16 +595,13 @@ class AdvancedFAPEGScraper:
     - Detecção de mudanças
     """
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, http_client: Optional[HTTPClient] = None):
         self.config = config
         self.base_url = config.FAPEG_BASE_URL
         self.editais_url = config.FAPEG_EDITAIS_URL
 
-        # Session HTTP
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Cliente HTTP compartilhado (pool, rate limit, GET condicional)
+        self.http = http_client or obter_cliente_http(config)
 
         # Componentes avançados
         self.cache = ResultCache(
@@ -491,6 +609,9 @@ class AdvancedFAPEGScraper:
             config.CACHE_TTL_HOURS
         ) if config.USE_CACHE else None
 
+        # Resultados de PDF por conteúdo (SHA-256), não por URL
+        self.store = obter_document_store(config) if config.USE_DOCUMENT_STORE else None
+
         self.monitor = StructureMonitor(config.STRUCTURE_CACHE_DIR)
 
         self.pdf_extractor = AdvancedPDFExtractor(config)
@@ -514,9 +635,9 @@ class AdvancedFAPEGScraper:
 
         # Fazer requisição
         try:
-            response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT)
+            response = self.http.get(url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_html(response.content, FILTRO_ESTRUTURA, self.config.HTML_PARSER_RAPIDO)
         except Exception as e:
             print(f"  Erro ao acessar {url}: {e}")
             return {}
@@ -609,24 +730,43 @@ class AdvancedFAPEGScraper:
         if self.cache and self.cache.existe(url_pdf):
             return self.cache.obter(url_pdf)
 
-        # Baixar PDF
+        # Baixar PDF em stream para disco e extrair texto do arquivo
+        hash_pdf = None
         try:
-            response = self.session.get(url_pdf, timeout=self.config.REQUEST_TIMEOUT)
-            pdf_bytes = response.content
+            with self.http.baixar_arquivo(url_pdf, repositorio=self.store) as caminho:
+                if self.store:
+                    hash_pdf = self.store.hash_da_url(url_pdf)
+                    anterior = self.store.obter_resultado(hash_pdf, 'texto_avancado')
+                    if anterior is not None:
+                        return {**anterior, 'url': url_pdf}
+
+                extracao = self.pdf_extractor.extrair(caminho)
         except Exception as e:
             print(f"  Erro ao baixar PDF: {e}")
             return {}
 
-        # Extrair texto
-        texto = self.pdf_extractor.extrair_texto(pdf_bytes)
+        if not extracao['paginas_ocr']:
+            metodo = 'normal'
+        elif len(extracao['paginas_ocr']) == extracao['paginas']:
+            metodo = 'ocr'
+        else:
+            metodo = 'misto'
 
         resultado = {
             'url': url_pdf,
-            'texto': texto,
-            'tamanho': len(texto),
-            'metodo': 'ocr' if len(texto) > 100 and self.config.USE_OCR else 'normal'
+            'texto': extracao['texto'],
+            'tamanho': len(extracao['texto']),
+            'metodo': metodo,
+            'paginas_ocr': extracao['paginas_ocr'],
+            'ocr': extracao['ocr'],
+            'sha256': hash_pdf
         }
 
+        # Sem texto (nem da camada de texto nem do OCR) nada é guardado por
+        # conteúdo, para que a próxima execução tente de novo
+        if hash_pdf and extracao['texto'].strip():
+            self.store.salvar_resultado(hash_pdf, 'texto_avancado', resultado)
+
         # Salvar no cache
         if self.cache:
             self.cache.salvar(url_pdf, resultado)
@@ -0,0 +1,156 @@
+import bisect
+import re
+from typing import List, NamedTuple, Optional, Sequence, Union
+
+from core import motor_extracao
+from core.motor_extracao import Token
+
+# Separador de páginas no texto bruto guardado (como no pdftotext)
+QUEBRA_PAGINA = '\f'
+
+PADRAO_HIFENIZACAO = re.compile(r'(\w)-[ \t]*\n[ \t]*([a-zà-ÿ])')
+PADRAO_ESPACOS = re.compile(r'[ \t\r\xa0\u200b]+')
+PADRAO_ESPACO_LINHA = re.compile(r' ?\n ?')
+PADRAO_LINHAS_VAZIAS = re.compile(r'\n{3,}')
+
+# "5. CRONOGRAMA", "5.1 - DOS REQUISITOS", "10) DISPOSIÇÕES FINAIS".
+# Começa pelo \n literal (busca rápida); o título em maiúsculas é conferido
+# em _indexar_secoes, para não confundir itens numerados com seções
+PADRAO_TITULO_SECAO = re.compile(
+    r'\n(\d{1,2}(?:\.\d{1,2}){0,3})\.?[ \t]*[-–—)]?[ \t]*([^\n]{3,100})'
+)
+
+
+class Pagina(NamedTuple):
+    numero: int  # a partir de 1
+    inicio: int
+    fim: int
+
+
+class Secao(NamedTuple):
+    numero: str  # '5', '5.1'
+    titulo: str
+    inicio: int  # início da linha do título
+    fim: int  # início da próxima seção de mesmo nível ou acima
+
+
+def juntar_paginas(paginas: Sequence[str]) -> str:
+    """Texto bruto do PDF com as páginas separadas por QUEBRA_PAGINA"""
+    return QUEBRA_PAGINA.join(paginas)
+
+
+def normalizar(texto: str) -> str:
+    """
+    Junta palavras hifenizadas na quebra de linha, reduz espaços a um só e
+    limita linhas em branco a uma (parágrafos continuam separados por \\n\\n)
+    """
+    texto = PADRAO_HIFENIZACAO.sub(r'\1\2', texto)
+    texto = PADRAO_ESPACOS.sub(' ', texto)
+    texto = PADRAO_ESPACO_LINHA.sub('\n', texto)
+    return PADRAO_LINHAS_VAZIAS.sub('\n\n', texto).strip()
+
+
+def _indexar_secoes(texto: str) -> List[Secao]:
+    titulos = []
+    for match in PADRAO_TITULO_SECAO.finditer('\n' + texto):
+        titulo = match.group(2).strip()
+        # Títulos de seção vêm em maiúsculas; itens de lista, não
+        if not titulo[0].isalpha() or titulo.upper() != titulo:
+            continue
+        titulos.append((match.group(1), titulo, match.start()))
+
+    # Uma passada com pilha das seções abertas (níveis crescentes): cada
+    # título fecha as de nível igual ou mais profundo
+    fins = [len(texto)] * len(titulos)
+    abertas = []
+    for i, (numero, _, inicio) in enumerate(titulos):
+        nivel = numero.count('.')
+        while abertas and abertas[-1][0] >= nivel:
+            fins[abertas.pop()[1]] = inicio
+        abertas.append((nivel, i))
+
+    return [
+        Secao(numero, titulo, inicio, fim)
+        for (numero, titulo, inicio), fim in zip(titulos, fins)
+    ]
+
+
+class EditalDocument:
+    """
+    Texto de um edital preparado uma única vez para todos os extratores
+
+    Guarda o texto normalizado (ver normalizar) e sua versão em minúsculas
+    com os mesmos offsets, onde começa e termina cada página e um índice das
+    seções numeradas ("5. CRONOGRAMA" -> trecho até a seção 6). Os tokens
+    de motor_extracao são calculados na primeira vez que alguém pede. Assim
+    cada extrator lê só as seções de que precisa, sem repetir lower(),
+    buscas DOTALL pelo documento inteiro ou concatenação de páginas.
+    """
+
+    def __init__(self, paginas: Sequence[str]):
+        partes = [normalizar(pagina) for pagina in paginas]
+
+        self.paginas: List[Pagina] = []
+        posicao = 0
+        for numero, parte in enumerate(partes, start=1):
+            self.paginas.append(Pagina(numero, posicao, posicao + len(parte)))
+            posicao += len(parte) + 1
+
+        self._inicios_paginas = [pagina.inicio for pagina in self.paginas]
+
+        self.texto = '\n'.join(partes)
+        self.minusculo = motor_extracao.minusculas(self.texto)
+        self.secoes = _indexar_secoes(self.texto)
+        self._tokens: Optional[List[Token]] = None
+        self._inicios_tokens: Optional[List[int]] = None
+
+    @classmethod
+    def de_texto(cls, texto: str) -> 'EditalDocument':
+        """Documento a partir do texto bruto (páginas separadas por QUEBRA_PAGINA)"""
+        return cls(texto.split(QUEBRA_PAGINA))
+
+    @classmethod
+    def obter(cls, texto: Union[str, 'EditalDocument']) -> 'EditalDocument':
+        """Aceita texto ou documento já montado (para os extratores)"""
+        return texto if isinstance(texto, cls) else cls.de_texto(texto)
+
+    def __len__(self) -> int:
+        return len(self.texto)
+
+    @property
+    def tokens(self) -> List[Token]:
+        if self._tokens is None:
+            self._tokens = motor_extracao.tokenizar(self.texto, self.minusculo)
+            self._inicios_tokens = [token.inicio for token in self._tokens]
+        return self._tokens
+
+    def tokens_em(self, inicio: int, fim: int) -> List[Token]:
+        """Tokens que começam em [inicio, fim)"""
+        tokens = self.tokens
+        return tokens[bisect.bisect_left(self._inicios_tokens, inicio):
+                      bisect.bisect_left(self._inicios_tokens, fim)]
+
+    def pagina_em(self, posicao: int) -> Optional[Pagina]:
+        """Página que contém o offset do texto normalizado"""
+        i = bisect.bisect_right(self._inicios_paginas, posicao) - 1
+        return self.paginas[i] if i >= 0 else None
+
+    def secoes_com(self, *palavras: str) -> List[Secao]:
+        """Seções cujo título contém alguma das palavras (em minúsculas)"""
+        return [
+            secao for secao in self.secoes
+            if any(palavra in secao.titulo.lower() for palavra in palavras)
+        ]
+
+    def secao(self, *palavras: str) -> Optional[Secao]:
+        """Primeira seção cujo título contém alguma das palavras"""
+        secoes = self.secoes_com(*palavras)
+        return secoes[0] if secoes else None
+
+    def trecho(self, secao: Secao) -> str:
+        return self.texto[secao.inicio:secao.fim]
+
+    def corpo(self, secao: Secao) -> str:
+        """Trecho da seção sem a linha do título"""
+        inicio = self.texto.find('\n', secao.inicio, secao.fim)
+        return self.texto[inicio + 1:secao.fim] if inicio != -1 else ''
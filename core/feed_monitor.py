@@ -0,0 +1,185 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.scraper import FAPEGScraper
+from core.wp_api import formatar_data
+
+
+class FeedMonitor:
+    """
+    Detecção barata de novidades pelo feed RSS da categoria de editais
+
+    Cada verificação é um único GET condicional do feed (/categoria/editais/feed/):
+    se o servidor responde 304 ou o lastBuildDate não mudou, não há nada a
+    fazer. Caso contrário, só os itens com GUID novo (ou com título/data
+    diferentes do que foi visto) seguem para detalhes e PDFs.
+
+    O estado (lastBuildDate e GUIDs vistos) só é gravado por confirmar(),
+    depois que os itens alterados foram processados, e só para os que
+    foram processados sem falha.
+    """
+
+    def __init__(self, config, scraper: FAPEGScraper):
+        self.config = config
+        self.scraper = scraper
+        self.http = scraper.http
+        self.feed_url = config.FAPEG_FEED_URL
+        self.arquivo = config.FEED_STATE_FILE
+        self.fuso_site = timezone(timedelta(hours=config.FUSO_HORARIO_SITE))
+
+        self.last_build_date = None
+        self.itens = {}  # guid -> marca (data + título)
+        self._pendente = None
+        self._carregar()
+
+    def _carregar(self):
+        if not os.path.exists(self.arquivo):
+            return
+
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            self.last_build_date = dados.get('last_build_date')
+            self.itens = dados.get('itens', {})
+        except (OSError, ValueError) as e:
+            print(f"Estado do feed ilegível ({e}), iniciando do zero")
+
+    @staticmethod
+    def _marca(item: Dict) -> str:
+        return f"{item['pub_date']}|{item['titulo']}"
+
+    @staticmethod
+    def _texto(elemento, tag: str) -> Optional[str]:
+        filho = elemento.find(tag)
+        if filho is None or filho.text is None:
+            return None
+        return filho.text.strip()
+
+    def ler_feed(self, conteudo: bytes) -> Tuple[Optional[str], List[Dict]]:
+        """lastBuildDate do canal e itens (guid, link, título, pubDate)"""
+        canal = ET.fromstring(conteudo).find('channel')
+        if canal is None:
+            raise ValueError("Feed sem elemento <channel>")
+
+        itens = []
+        for item in canal.findall('item'):
+            link = self._texto(item, 'link')
+            if not link:
+                continue
+
+            itens.append({
+                'guid': self._texto(item, 'guid') or link,
+                'link': link,
+                'titulo': self._texto(item, 'title') or '',
+                'pub_date': self._texto(item, 'pubDate') or ''
+            })
+
+        return self._texto(canal, 'lastBuildDate'), itens
+
+    def _converter_item(self, item: Dict) -> Dict:
+        """
+        Item do feed -> edital básico (sem detalhes), como na listagem
+
+        O feed não traz a data da última atualização: data_atualizacao fica
+        None, e por isso esses registros não entram no estado da coleta
+        incremental (ver main.py).
+        """
+        data_publicacao = None
+        if item['pub_date']:
+            try:
+                # pubDate vem em UTC; a data exibida no site é a de Brasília
+                publicado = parsedate_to_datetime(item['pub_date'])
+                if publicado.tzinfo is not None:
+                    publicado = publicado.astimezone(self.fuso_site)
+                data_publicacao = formatar_data(publicado)
+            except (TypeError, ValueError):
+                data_publicacao = item['pub_date']
+
+        return self.scraper.montar_edital(item['titulo'], item['link'], data_publicacao, None)
+
+    def verificar(self) -> List[Dict]:
+        """
+        Consulta o feed e retorna os editais básicos novos ou alterados
+
+        Não grava estado; chame confirmar() depois de processá-los. Se o
+        feed mudou mas nenhum item é novo ou alterado, o novo lastBuildDate
+        é gravado aqui mesmo, já que não haverá processamento a confirmar.
+        """
+        try:
+            response = self.http.get(self.feed_url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Erro ao acessar o feed {self.feed_url}: {e}")
+            return []
+
+        # Num 304 o corpo vem do cache local; ainda é comparado com o estado,
+        # caso a última verificação não tenha sido confirmada
+        if getattr(response, 'reutilizada', False):
+            print("Feed não modificado (304)")
+
+        try:
+            last_build_date, itens = self.ler_feed(response.content)
+        except (ET.ParseError, ValueError) as e:
+            print(f"Feed inválido: {e}")
+            return []
+
+        if last_build_date and last_build_date == self.last_build_date:
+            print(f"Feed sem novidades desde {last_build_date}")
+            return []
+
+        alterados = [i for i in itens if self.itens.get(i['guid']) != self._marca(i)]
+        self._pendente = (last_build_date, itens)
+
+        print(f"Feed: {len(itens)} itens, {len(alterados)} novos ou alterados")
+        if not alterados:
+            self.confirmar()
+
+        return [self._converter_item(item) for item in alterados]
+
+    def iter_editais(self, editais_basicos: List[Dict]) -> Iterator[Dict]:
+        """Detalha os editais retornados por verificar()"""
+        return self.scraper.iter_detalhes(editais_basicos)
+
+    def confirmar(self, urls_ok: Optional[Iterable[str]] = None):
+        """
+        Grava o estado do último feed lido por verificar()
+
+        Args:
+            urls_ok: URLs dos editais processados sem falha (None = todos).
+                Itens alterados fora dessa lista continuam pendentes, e o
+                lastBuildDate só avança quando não sobra nenhum: a próxima
+                verificação os processa de novo.
+        """
+        if self._pendente is None:
+            return
+
+        last_build_date, itens = self._pendente
+        self._pendente = None
+
+        alterados = [i for i in itens if self.itens.get(i['guid']) != self._marca(i)]
+        if urls_ok is None:
+            confirmados = alterados
+        else:
+            urls_ok = set(urls_ok)
+            confirmados = [i for i in alterados if i['link'] in urls_ok]
+
+        self.itens.update({item['guid']: self._marca(item) for item in confirmados})
+        faltam = len(alterados) - len(confirmados)
+        if faltam:
+            print(f"Feed: {faltam} itens com falha ficam para a próxima verificação")
+        else:
+            self.last_build_date = last_build_date
+
+        dados = {
+            'timestamp': datetime.now().isoformat(),
+            'last_build_date': self.last_build_date,
+            'itens': self.itens
+        }
+
+        with open(f"{self.arquivo}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+        os.replace(f"{self.arquivo}.tmp", self.arquivo)
@@ -0,0 +1,224 @@
+import heapq
+import itertools
+import re
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+
+PRIORIDADE_PRINCIPAL = 0
+PRIORIDADE_RESULTADO = 1
+PRIORIDADE_ANEXO = 2
+
+TIPOS_DOCUMENTO = {
+    PRIORIDADE_PRINCIPAL: 'principal',
+    PRIORIDADE_RESULTADO: 'resultado',
+    PRIORIDADE_ANEXO: 'anexo'
+}
+
+PADRAO_RESULTADO = re.compile(r'resultado|retifica|errata|homologa', re.IGNORECASE)
+PADRAO_ANEXO = re.compile(r'anexo|formul[aá]rio|modelo|planilha|declara[cç]', re.IGNORECASE)
+
+# Links que certamente não são PDFs não entram na fila (seriam baixados só
+# para serem recusados); URLs sem extensão são verificadas no download
+EXTENSOES_NAO_PDF = (
+    '.doc', '.docx', '.odt', '.rtf', '.xls', '.xlsx', '.ods', '.csv',
+    '.ppt', '.pptx', '.odp', '.zip', '.rar', '.7z',
+    '.jpg', '.jpeg', '.png', '.gif'
+)
+
+
+def listar_documentos(edital: Dict) -> List[Dict]:
+    """
+    Todos os documentos linkados pelo edital, com tipo e prioridade
+
+    O documento principal é o primeiro PDF que não é resultado,
+    retificação ou anexo; resultados/retificações vêm em seguida e os
+    anexos por último. URLs repetidas e arquivos de outros formatos
+    (EXTENSOES_NAO_PDF) ficam de fora.
+    """
+    documentos = []
+    vistos = set()
+    tem_principal = False
+
+    links = (
+            edital.get('links_pdf', []) +
+            edital.get('links_resultados', []) +
+            edital.get('links_anexos', [])
+    )
+
+    for link in links:
+        url = link.get('url')
+        if not url or url in vistos:
+            continue
+        if urlparse(url).path.lower().endswith(EXTENSOES_NAO_PDF):
+            continue
+        vistos.add(url)
+
+        referencia = f"{link.get('texto', '')} {url}"
+        if PADRAO_RESULTADO.search(referencia):
+            prioridade = PRIORIDADE_RESULTADO
+        elif PADRAO_ANEXO.search(referencia) or not url.lower().endswith('.pdf'):
+            prioridade = PRIORIDADE_ANEXO
+        elif not tem_principal:
+            prioridade = PRIORIDADE_PRINCIPAL
+            tem_principal = True
+        else:
+            prioridade = PRIORIDADE_ANEXO
+
+        documentos.append({
+            'url': url,
+            'texto': link.get('texto', ''),
+            'tipo': TIPOS_DOCUMENTO[prioridade],
+            'prioridade': prioridade
+        })
+
+    return documentos
+
+
+def documentos_com_falha(edital: Dict) -> List[Dict]:
+    """
+    Documentos do edital (mesclados pela fila) sem resultado ou com erro
+
+    Só falhas transitórias (tempo esgotado, 5xx, rede) ficam vazias; URLs
+    que não são PDF e links mortos (4xx) têm resultado e não contam.
+    """
+    return [
+        documento for documento in edital.get('documentos', [])
+        if not documento['detalhes'] or 'erro' in documento['detalhes']
+    ]
+
+
+class _EditalPendente:
+    """Documentos de um edital ainda em processamento"""
+
+    def __init__(self, edital: Dict, documentos: List[Dict]):
+        self.edital = edital
+        self.documentos = documentos
+        self.resultados = [None] * len(documentos)
+        self.faltam = len(documentos)
+        self.future = Future()
+
+
+class FilaDocumentos:
+    """
+    Fila de prioridade de documentos (PDFs) de todos os editais
+
+    Cada edital enviado tem todos os seus documentos agendados num heap
+    global, ordenado primeiro pela chegada do edital: os editais terminam
+    na ordem da coleta, e a saída pode ser gravada à medida que ficam
+    prontos. Dentro de um edital, o documento principal sai antes de
+    resultados/retificações, que saem antes de anexos. `num_workers`
+    threads consomem a fila chamando `processar(url)`; quando o último
+    documento de um edital termina, os resultados são mesclados nele e o
+    Future devolvido por enviar() é concluído.
+    """
+
+    def __init__(self, processar: Callable[[str], Dict], num_workers: int):
+        self.processar = processar
+        self._heap = []
+        self._sequencia = itertools.count()
+        self._editais = itertools.count()
+        self._condicao = threading.Condition()
+        self._fechada = False
+        self._cancelada = False
+
+        self._threads = [
+            threading.Thread(target=self._trabalhar, name=f"documentos-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def enviar(self, edital: Dict) -> Future:
+        """Agenda os documentos do edital; o Future resolve para o edital mesclado"""
+        pendente = _EditalPendente(edital, listar_documentos(edital))
+
+        if not pendente.documentos:
+            pendente.future.set_result(edital)
+            return pendente.future
+
+        with self._condicao:
+            ordem = next(self._editais)
+            for indice, documento in enumerate(pendente.documentos):
+                heapq.heappush(
+                    self._heap,
+                    (ordem, documento['prioridade'], next(self._sequencia), pendente, indice)
+                )
+            self._condicao.notify(len(pendente.documentos))
+
+        return pendente.future
+
+    def _trabalhar(self):
+        while True:
+            with self._condicao:
+                while not self._heap and not self._fechada:
+                    self._condicao.wait()
+                if not self._heap:
+                    return
+                _, _, _, pendente, indice = heapq.heappop(self._heap)
+
+            documento = pendente.documentos[indice]
+            try:
+                resultado = self.processar(documento['url'])
+            except Exception as e:
+                print(f"    Erro no documento {documento['url']}: {e}")
+                resultado = {'erro': str(e)}
+
+            with self._condicao:
+                pendente.resultados[indice] = resultado
+                pendente.faltam -= 1
+                concluido = pendente.faltam == 0
+
+            if concluido:
+                # Sem o try, um erro aqui mataria a thread e deixaria o future
+                # sem resultado (quem espera por ele travaria para sempre)
+                try:
+                    pendente.future.set_result(self._mesclar(pendente))
+                except Exception as e:
+                    print(f"    Erro ao montar o edital {pendente.edital.get('url')}: {e}")
+                    pendente.future.set_exception(e)
+
+    @staticmethod
+    def _mesclar(pendente: _EditalPendente) -> Dict:
+        edital = pendente.edital
+
+        edital['documentos'] = []
+        for documento, resultado in zip(pendente.documentos, pendente.resultados):
+            registro = {k: documento[k] for k in ('url', 'texto', 'tipo')}
+            registro['detalhes'] = resultado or {}
+            edital['documentos'].append(registro)
+
+            # Compatibilidade: detalhes_pdf continua sendo o documento principal
+            if (documento['tipo'] == 'principal' and resultado
+                    and not resultado.get('nao_pdf') and not resultado.get('status_http')):
+                edital['detalhes_pdf'] = resultado
+
+        return edital
+
+    def fechar(self, cancelar: bool = False):
+        """
+        Processa o que resta na fila e encerra as threads
+
+        Com cancelar=True (erro ou Ctrl+C), os documentos ainda na fila são
+        descartados, os futures dos editais pendentes são cancelados e não
+        há espera pelas threads: cada uma termina ao concluir o documento
+        em andamento.
+        """
+        with self._condicao:
+            self._fechada = True
+            if cancelar:
+                self._cancelada = True
+                pendentes = {id(item[3]): item[3] for item in self._heap}
+                self._heap.clear()
+            self._condicao.notify_all()
+
+        if cancelar:
+            for pendente in pendentes.values():
+                pendente.future.cancel()
+
+        if self._cancelada:
+            return
+
+        for thread in self._threads:
+            thread.join()
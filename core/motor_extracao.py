@@ -0,0 +1,284 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+MESES = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'marco': 3, 'abril': 4,
+    'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
+    'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
+}
+
+# Depois do primeiro dígito: data numérica, data por extenso ou percentual.
+# O lookbehind faz só o início de cada número ser tentado (números comuns,
+# como itens "3.1.2", não viram token e não são reexaminados dígito a dígito)
+_APOS_DIGITO = (
+    r'(?<![\d.,].)'
+    r'(?:\d?[/\-]\d{1,2}[/\-]\d{4}'
+    r'|\d?\s+de\s+[^\W\d_]+\s+de\s+\d{4}'
+    r'|[\d.,]*\s*%)'
+)
+
+# Uma única regex para o documento inteiro, aplicada ao texto em minúsculas.
+# Toda alternativa começa por um caractere literal, o que permite ao motor
+# de regex saltar direto para as posições candidatas (com IGNORECASE ou
+# grupos nomeados no topo isso se perde e a varredura fica ~8x mais lenta).
+# A alternação consome cada trecho uma vez: um "R$ 1.000,00" vira um só
+# token, em vez de ser encontrado de novo por vários padrões.
+PADRAO_TOKENS = re.compile('|'.join(
+    [r'r\$\s*[\d.,]*\d[\d.,]*']
+    + [f'{digito}{_APOS_DIGITO}' for digito in '0123456789']
+    + [
+        r'até\s+\d+\s+projetos?',
+        r'contrapartida',
+        r'inscriç(?:ão|ões)',
+        r'resultado\s+(?:preliminar|parcial|final)',
+        r'cronograma',
+        r'calendário',
+        r'prazo',
+        r'\n\n'
+    ]
+))
+
+# Padrões compartilhados com os extratores por seção (pdf_extractor,
+# nlp_analyzer), definidos só aqui para não divergirem do motor
+DATA_NUMERICA = r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})'
+PADRAO_DATA_NUMERICA = re.compile(DATA_NUMERICA)
+PADRAO_DATA = re.compile(DATA_NUMERICA + r'|(\d{1,2})\s+de\s+([^\W\d_]+)\s+de\s+(\d{4})')
+PADRAO_ITEM_LISTA = re.compile(r'(?:^|\n)\s*[\d\-•]\s*([^\n]+)')
+
+# Seções sem título numerado são buscadas em no máximo JANELA_SECAO
+# caracteres a partir da palavra-chave (custo linear em saídas de OCR)
+JANELA_SECAO = 20000
+
+PADRAO_NUMERO = re.compile(r'\d+')
+PADRAO_DIGITO = re.compile(r'\d')
+PADRAO_INTERVALO = re.compile(r'\s+(?:a|até|e)\s+', re.IGNORECASE)
+
+# Seções de datas, na ordem em que são consultadas
+PALAVRAS_SECAO = ('cronograma', 'calendario', 'prazo')
+
+
+class Token(NamedTuple):
+    tipo: str  # moeda, quantidade, data, percentual, palavra, quebra
+    texto: str  # trecho do texto original
+    valor: object  # float (moeda), int (quantidade), 'AAAA-MM-DD' (data), chave (palavra)
+    inicio: int
+    fim: int
+
+
+def _valor_moeda(trecho: str) -> Optional[float]:
+    """'R$ 1.234.567,89' -> 1234567.89"""
+    numero = trecho[2:].strip().rstrip('.,')
+    try:
+        return float(numero.replace('.', '').replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def _valor_data(trecho: str) -> Optional[str]:
+    match = PADRAO_DATA.fullmatch(trecho)
+    if match.group(1):
+        dia, mes, ano = int(match.group(1)), int(match.group(2)), int(match.group(3))
+    else:
+        mes = MESES.get(match.group(5))
+        if mes is None:
+            return None
+        dia, ano = int(match.group(4)), int(match.group(6))
+
+    if not (1 <= dia <= 31 and 1 <= mes <= 12):
+        return None
+    return f"{ano:04d}-{mes:02d}-{dia:02d}"
+
+
+def _chave_palavra(trecho: str) -> str:
+    if trecho.startswith('inscri'):
+        return 'inscricao'
+    if trecho.startswith('resultado'):
+        return 'resultado_final' if trecho.endswith('final') else 'resultado_preliminar'
+    return trecho.replace('á', 'a')
+
+
+def minusculas(texto: str) -> str:
+    """texto.lower() com os mesmos offsets do original"""
+    minusculo = texto.lower()
+    if len(minusculo) != len(texto):
+        # lower() mudou o tamanho (caracteres raros como 'İ')
+        minusculo = ''.join(c.lower() if len(c.lower()) == 1 else c for c in texto)
+    return minusculo
+
+
+def tokenizar(texto: str, texto_minusculo: Optional[str] = None) -> List[Token]:
+    """
+    Tokens tipados (valores, datas, quantidades, palavras-chave) com offsets,
+    numa única passada pelo documento
+
+    Args:
+        texto: texto original (os tokens guardam trechos dele)
+        texto_minusculo: minusculas(texto), se já calculado
+    """
+    minusculo = texto_minusculo if texto_minusculo is not None else minusculas(texto)
+
+    tokens = []
+
+    for match in PADRAO_TOKENS.finditer(minusculo):
+        trecho = match.group()
+        inicio, fim = match.span()
+        primeiro = trecho[0]
+
+        if primeiro == 'r' and trecho[1] == '$':
+            tipo, valor = 'moeda', _valor_moeda(trecho)
+        elif primeiro.isdigit():
+            if trecho.endswith('%'):
+                tipo, valor = 'percentual', None
+            else:
+                tipo, valor = 'data', _valor_data(trecho)
+        elif primeiro == '\n':
+            tipo, valor = 'quebra', None
+        elif primeiro == 'a':
+            tipo, valor = 'quantidade', int(PADRAO_NUMERO.search(trecho).group())
+        else:
+            tipo, valor = 'palavra', _chave_palavra(' '.join(trecho.split()))
+
+        tokens.append(Token(tipo, texto[inicio:fim], valor, inicio, fim))
+
+    return tokens
+
+
+def _seguintes(tokens: List[Token], texto: str) -> List[Optional[int]]:
+    """
+    Para cada token, o índice do primeiro token de valor depois dele, desde
+    que não haja nenhum número entre os dois (equivale ao [^\\d]* dos
+    padrões antigos)
+
+    Calculado numa passada de trás para frente, olhando cada intervalo entre
+    tokens uma vez só: procurar a partir de cada palavra-chave seria
+    quadrático em textos com muitas palavras-chave e nenhum valor.
+    """
+    seguintes = [None] * len(tokens)
+    proximo = None
+
+    for i in range(len(tokens) - 2, -1, -1):
+        depois = tokens[i + 1]
+        if depois.tipo not in ('palavra', 'quebra'):
+            proximo = i + 1
+        if proximo is not None and PADRAO_DIGITO.search(texto, tokens[i].fim, depois.inicio):
+            proximo = None
+        seguintes[i] = proximo
+
+    return seguintes
+
+
+def extrair_valores(tokens: List[Token], texto: str) -> Dict:
+    """Maior valor em R$, quantidade de projetos e contrapartida"""
+    valores = {
+        'valor_total': None,
+        'valor_por_projeto': None,
+        'quantidade_projetos': None,
+        'contrapartida': None
+    }
+
+    seguintes = None
+
+    for i, token in enumerate(tokens):
+        if token.tipo == 'moeda' and token.valor is not None:
+            if not valores['valor_total'] or token.valor > valores['valor_total']:
+                valores['valor_total'] = token.valor
+
+        elif token.tipo == 'quantidade' and valores['quantidade_projetos'] is None:
+            valores['quantidade_projetos'] = token.valor
+
+        elif token.tipo == 'palavra' and token.valor == 'contrapartida' and valores['contrapartida'] is None:
+            if seguintes is None:
+                seguintes = _seguintes(tokens, texto)
+            j = seguintes[i]
+            if j is not None and tokens[j].tipo in ('moeda', 'percentual'):
+                valores['contrapartida'] = tokens[j].texto
+
+    return valores
+
+
+def _secoes_datas(tokens: List[Token]) -> List[List[Token]]:
+    """Trechos da primeira ocorrência de cada palavra de seção até a próxima linha em branco"""
+    primeiras = {}
+    for i, token in enumerate(tokens):
+        if token.tipo == 'palavra' and token.valor in PALAVRAS_SECAO:
+            primeiras.setdefault(token.valor, i)
+
+    secoes = []
+    for chave in PALAVRAS_SECAO:
+        if chave in primeiras:
+            i = primeiras[chave]
+            fim = next((j for j in range(i + 1, len(tokens)) if tokens[j].tipo == 'quebra'), len(tokens))
+            secoes.append(tokens[i:fim])
+
+    return secoes
+
+
+def _buscar_data(tokens: List[Token], seguintes: List[Optional[int]], chave: str) -> Optional[Token]:
+    for i, token in enumerate(tokens):
+        if token.tipo == 'palavra' and token.valor == chave:
+            j = seguintes[i]
+            if j is not None and tokens[j].tipo == 'data':
+                return tokens[j]
+    return None
+
+
+def _buscar_intervalo(
+        tokens: List[Token],
+        seguintes: List[Optional[int]],
+        texto: str,
+        chave: str
+) -> Optional[tuple]:
+    """Primeiro "<chave> ... data a|até|e data" """
+    for i, token in enumerate(tokens):
+        if token.tipo == 'palavra' and token.valor == chave:
+            j = seguintes[i]
+            if j is None or j + 1 >= len(tokens):
+                continue
+
+            inicio, fim = tokens[j], tokens[j + 1]
+            if (inicio.tipo == 'data' and fim.tipo == 'data'
+                    and PADRAO_INTERVALO.fullmatch(texto, inicio.fim, fim.inicio)):
+                return inicio, fim
+    return None
+
+
+def extrair_datas(tokens: List[Token], texto: str, secoes: Optional[List[List[Token]]] = None) -> Dict:
+    """
+    Datas de inscrição e resultados
+
+    Busca primeiro nas seções de cronograma/calendário/prazo e, se não
+    houver nenhuma, no documento inteiro.
+
+    Args:
+        secoes: tokens de cada seção de datas, se já localizadas (ver
+            EditalDocument); sem elas, as seções vão de cada palavra de seção
+            até a próxima linha em branco
+    """
+    datas = {
+        'inscricoes_inicio': None,
+        'inscricoes_fim': None,
+        'resultado_preliminar': None,
+        'resultado_final': None,
+        'execucao_inicio': None,
+        'execucao_fim': None
+    }
+
+    escopos = [
+        (escopo, _seguintes(escopo, texto))
+        for escopo in secoes or _secoes_datas(tokens) or [tokens]
+    ]
+
+    for escopo, seguintes in escopos:
+        intervalo = _buscar_intervalo(escopo, seguintes, texto, 'inscricao')
+        if intervalo:
+            datas['inscricoes_inicio'], datas['inscricoes_fim'] = intervalo[0].texto, intervalo[1].texto
+            break
+
+    for campo in ('resultado_preliminar', 'resultado_final'):
+        for escopo, seguintes in escopos:
+            token = _buscar_data(escopo, seguintes, campo)
+            if token:
+                datas[campo] = token.texto
+                break
+
+    return datas
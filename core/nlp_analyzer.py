@@ -1,8 +1,97 @@
 import re
-from typing import List, Dict
+from typing import List, Dict, Union
 
 import spacy
 
+from core.documento import EditalDocument
+from core.motor_extracao import DATA_NUMERICA, JANELA_SECAO, PADRAO_DATA_NUMERICA, PADRAO_ITEM_LISTA
+from core.taxonomia import Taxonomia
+
+TAXONOMIA_REQUISITOS = Taxonomia({
+    # Sentenças que indicam requisitos
+    'indicador': {
+        'requisito': [
+            'deve', 'deverá', 'precisa', 'necessário', 'obrigatório',
+            'exigido', 'requisito', 'critério', 'condição', 'elegível'
+        ]
+    },
+    # Ordem = prioridade quando a sentença cai em mais de um tipo
+    'tipo': {
+        'vinculo': ['vinculado', 'vínculo', 'lotação', 'servidor', 'docente'],
+        'titulacao': ['doutor', 'mestre', 'graduado', 'pós-graduação', 'titulação'],
+        'experiencia': ['experiência', 'atuação', 'anos de'],
+        'documentacao': ['documento', 'comprovante', 'certificado', 'declaração'],
+        'financeiro': ['cnpj', 'cpf', 'conta bancária', 'regularidade fiscal'],
+        'tecnico': ['lattes', 'publicações', 'projeto', 'proposta']
+    },
+    'obrigatorio': {
+        'sim': [
+            'obrigatório', 'deve', 'deverá', 'necessário',
+            'exigido', 'imprescindível'
+        ]
+    }
+})
+
+# Áreas de interesse e público da UniRV
+TAXONOMIA_RELEVANCIA = Taxonomia({
+    'areas': {
+        'agronomia': ['agricultura', 'agronomia', 'rural', 'agropecuária'],
+        'saude': ['saúde', 'medicina', 'enfermagem', 'farmácia'],
+        'tecnologia': ['tecnologia', 'inovação', 'software', 'ti'],
+        'educacao': ['educação', 'ensino', 'pedagógico'],
+        'meio_ambiente': ['ambiente', 'sustentabilidade']
+    },
+    'publico': {
+        'docentes': ['docente', 'professor'],
+        'estudantes': ['estudante', 'aluno'],
+        'instituicao': ['universidade', 'ict']
+    },
+    'complexidade': {
+        'requisitos': ['requisito', 'condição', 'exigência']
+    }
+})
+
+# Perfil do beneficiário; titulações em ordem de prioridade (a primeira
+# encontrada é a mínima exigida)
+TAXONOMIA_PERFIL = Taxonomia({
+    'publico_alvo': {
+        'pesquisadores': ['pesquisador', 'cientista'],
+        'docentes': ['docente', 'professor'],
+        'estudantes': ['estudante', 'aluno', 'discente'],
+        'empresas': ['empresa', 'cnpj', 'mei'],
+        'empreendedores': ['empreendedor', 'startup']
+    },
+    'titulacao': {
+        'doutorado': ['doutorado'],
+        'mestrado': ['mestrado'],
+        'graduação': ['graduação'],
+        'especialização': ['especialização']
+    },
+    'vinculo': {
+        'ICT': ['ict', 'universidade', 'instituição']
+    }
+})
+
+PESOS_PUBLICO_UNIRV = {'docentes': 15, 'estudantes': 15, 'instituicao': 10}
+
+# Todas as repetições são limitadas (a linha ou a uma janela fixa): um .*?
+# sem limite faz cada ocorrência da palavra varrer o resto do texto e, em
+# saídas de OCR sem quebras de linha, a busca fica quadrática
+PADRAO_PARAGRAFO = re.compile(r'[^\n]+(?:\n[^\n]+)*')
+PADRAO_FASE = re.compile(r'(?:^|\n)\s*[\d\-•]\s*([^:\n]+):\s*([^\n]+)')
+
+# Seção de cronograma quando o PDF não tem títulos numerados: da palavra
+# até o próximo item numerado ou anexo, em no máximo JANELA_SECAO caracteres
+PADRAO_FIM_CRONOGRAMA = re.compile(r'\n\s*\d+\.|anexo', re.IGNORECASE)
+
+PADROES_DATAS_IMPORTANTES = {
+    'inscricoes_inicio': re.compile(r'inscrições.{0,200}?de\s*(' + DATA_NUMERICA + ')', re.IGNORECASE),
+    'inscricoes_fim': re.compile(r'até\s*(' + DATA_NUMERICA + ')', re.IGNORECASE),
+    'resultado': re.compile(r'resultado.{0,200}?(' + DATA_NUMERICA + ')', re.IGNORECASE)
+}
+
+TITULOS_REQUISITOS = ('requisito', 'condiç', 'elegib')
+
 
 class EditalNLPAnalyzer:
     """
@@ -20,54 +109,40 @@ class EditalNLPAnalyzer:
             print("Execute: python -m spacy download pt_core_news_lg")
             self.nlp = None
 
-    def extrair_requisitos_nlp(self, texto: str) -> List[Dict]:
+    # Os métodos de análise aceitam texto ou um EditalDocument já montado
+    # (ver EditalPDFExtractor.analisar_texto)
+
+    def extrair_requisitos_nlp(self, texto: Union[str, EditalDocument]) -> List[Dict]:
         """Extrai requisitos usando NLP"""
+        documento = EditalDocument.obter(texto)
         if not self.nlp:
-            return self._extrair_requisitos_regex(texto)
+            return self._extrair_requisitos_regex(documento)
 
-        doc = self.nlp(texto)
+        doc = self.nlp(documento.texto)
         requisitos = []
 
-        # Padrões de sentenças que indicam requisitos
-        palavras_chave_requisitos = [
-            'deve', 'deverá', 'precisa', 'necessário', 'obrigatório',
-            'exigido', 'requisito', 'critério', 'condição', 'elegível'
-        ]
-
         for sent in doc.sents:
             sent_text = sent.text.strip()
-            sent_lower = sent_text.lower()
+
+            # Uma passada classifica a sentença em todas as dimensões
+            classes = TAXONOMIA_REQUISITOS.classificar(sent_text)
 
             # Verificar se é um requisito
-            if any(palavra in sent_lower for palavra in palavras_chave_requisitos):
+            if classes['indicador']:
                 requisito = {
                     'texto': sent_text,
-                    'tipo': self._classificar_requisito(sent_text),
+                    'tipo': classes['tipo'][0] if classes['tipo'] else 'geral',
                     'entidades': self._extrair_entidades(sent),
-                    'obrigatorio': self._eh_obrigatorio(sent_text)
+                    'obrigatorio': bool(classes['obrigatorio'])
                 }
                 requisitos.append(requisito)
 
         return requisitos
 
     def _classificar_requisito(self, texto: str) -> str:
-        """Classifica tipo de requisito"""
-        texto_lower = texto.lower()
-
-        classificacao = {
-            'vinculo': ['vinculado', 'vínculo', 'lotação', 'servidor', 'docente'],
-            'titulacao': ['doutor', 'mestre', 'graduado', 'pós-graduação', 'titulação'],
-            'experiencia': ['experiência', 'atuação', 'anos de'],
-            'documentacao': ['documento', 'comprovante', 'certificado', 'declaração'],
-            'financeiro': ['cnpj', 'cpf', 'conta bancária', 'regularidade fiscal'],
-            'tecnico': ['lattes', 'publicações', 'projeto', 'proposta']
-        }
-
-        for tipo, palavras in classificacao.items():
-            if any(palavra in texto_lower for palavra in palavras):
-                return tipo
-
-        return 'geral'
+        """Classifica tipo de requisito (primeiro tipo na ordem declarada)"""
+        tipos = TAXONOMIA_REQUISITOS.classificar(texto)['tipo']
+        return tipos[0] if tipos else 'geral'
 
     def _extrair_entidades(self, sent) -> List[Dict]:
         """Extrai entidades nomeadas da sentença"""
@@ -84,36 +159,40 @@ class EditalNLPAnalyzer:
 
     def _eh_obrigatorio(self, texto: str) -> bool:
         """Determina se requisito é obrigatório"""
-        palavras_obrigatorias = [
-            'obrigatório', 'deve', 'deverá', 'necessário',
-            'exigido', 'imprescindível'
-        ]
-
-        texto_lower = texto.lower()
-        return any(palavra in texto_lower for palavra in palavras_obrigatorias)
+        return bool(TAXONOMIA_REQUISITOS.classificar(texto)['obrigatorio'])
 
-    def _extrair_requisitos_regex(self, texto: str) -> List[Dict]:
+    def _extrair_requisitos_regex(self, documento: EditalDocument) -> List[Dict]:
         """Fallback: extração por regex quando spaCy não disponível"""
         requisitos = []
 
-        # Buscar seções de requisitos
-        secoes = re.split(r'\n\s*\n', texto)
-
-        for secao in secoes:
-            if any(palavra in secao.lower() for palavra in ['requisito', 'condição', 'elegib']):
-                # Extrair itens numerados ou com bullets
-                itens = re.findall(r'(?:^|\n)\s*[\d\-•]\s*([^\n]+)', secao)
-
-                for item in itens:
-                    requisitos.append({
-                        'texto': item.strip(),
-                        'tipo': self._classificar_requisito(item),
-                        'obrigatorio': self._eh_obrigatorio(item)
-                    })
+        # Seções numeradas de requisitos ou, sem elas, os parágrafos que
+        # falam de requisitos
+        secoes = documento.secoes_com(*TITULOS_REQUISITOS)
+        if secoes:
+            trechos = [documento.corpo(secao) for secao in secoes]
+        else:
+            trechos = [
+                match.group() for match in PADRAO_PARAGRAFO.finditer(documento.texto)
+                if any(
+                    palavra in documento.minusculo[match.start():match.end()]
+                    for palavra in ['requisito', 'condição', 'elegib']
+                )
+            ]
+
+        for trecho in trechos:
+            # Extrair itens numerados ou com bullets
+            itens = PADRAO_ITEM_LISTA.findall(trecho)
+
+            for item in itens:
+                requisitos.append({
+                    'texto': item.strip(),
+                    'tipo': self._classificar_requisito(item),
+                    'obrigatorio': self._eh_obrigatorio(item)
+                })
 
         return requisitos
 
-    def extrair_perfil_beneficiario(self, texto: str) -> Dict:
+    def extrair_perfil_beneficiario(self, texto: Union[str, EditalDocument]) -> Dict:
         """Extrai perfil detalhado do beneficiário"""
         perfil = {
             'publico_alvo': [],
@@ -126,62 +205,49 @@ class EditalNLPAnalyzer:
         if not self.nlp:
             return perfil
 
-        doc = self.nlp(texto)
+        documento = EditalDocument.obter(texto)
+        doc = self.nlp(documento.texto)
 
-        # Identificar público-alvo
-        padroes_publico = {
-            'pesquisadores': ['pesquisador', 'cientista'],
-            'docentes': ['docente', 'professor'],
-            'estudantes': ['estudante', 'aluno', 'discente'],
-            'empresas': ['empresa', 'cnpj', 'mei'],
-            'empreendedores': ['empreendedor', 'startup']
-        }
+        # Público-alvo, titulação e vínculo numa única passada, com limites
+        # de palavra (sem 'ict' casando dentro de 'restrict', 'mei' em 'meio')
+        classes = TAXONOMIA_PERFIL.classificar(documento.minusculo)
 
-        for tipo, palavras in padroes_publico.items():
-            if any(palavra in texto.lower() for palavra in palavras):
-                perfil['publico_alvo'].append(tipo)
+        perfil['publico_alvo'] = classes['publico_alvo']
 
-        # Titulação mínima
-        titulacoes = ['doutorado', 'mestrado', 'graduação', 'especialização']
-        for tit in titulacoes:
-            if tit in texto.lower():
-                perfil['titulacao_minima'] = tit
-                break
+        if classes['titulacao']:
+            perfil['titulacao_minima'] = classes['titulacao'][0]
 
-        # Vínculo institucional
-        if any(palavra in texto.lower() for palavra in ['ict', 'universidade', 'instituição']):
+        if classes['vinculo']:
             perfil['vinculo_institucional'] = 'ICT'
 
         return perfil
 
-    def extrair_cronograma_estruturado(self, texto: str) -> Dict:
+    def extrair_cronograma_estruturado(self, texto: Union[str, EditalDocument]) -> Dict:
         """Extrai cronograma estruturado"""
+        documento = EditalDocument.obter(texto)
         cronograma = {
             'fases': [],
             'datas_importantes': {}
         }
 
-        # Padrões de datas
-        padrao_data = r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})'
-
-        # Buscar seção de cronograma
-        match_cronograma = re.search(
-            r'cronograma.*?(?=\n\s*\d+\.|ANEXO|$)',
-            texto,
-            re.IGNORECASE | re.DOTALL
-        )
-
-        if match_cronograma:
-            texto_cronograma = match_cronograma.group(0)
-
+        # Seção numerada de cronograma; sem ela, busca no texto inteiro
+        secao = documento.secao('cronograma')
+        if secao:
+            texto_cronograma = documento.corpo(secao)
+        else:
+            texto_cronograma = None
+            inicio = documento.minusculo.find('cronograma')
+            if inicio != -1:
+                limite = min(inicio + JANELA_SECAO, len(documento.texto))
+                fim = PADRAO_FIM_CRONOGRAMA.search(documento.texto, inicio, limite)
+                texto_cronograma = documento.texto[inicio:fim.start() if fim else limite]
+
+        if texto_cronograma:
             # Extrair fases com datas
-            fases = re.findall(
-                r'(?:^|\n)\s*[\d\-•]\s*([^:]+):\s*([^\n]+)',
-                texto_cronograma
-            )
+            fases = PADRAO_FASE.findall(texto_cronograma)
 
             for fase, info in fases:
-                datas = re.findall(padrao_data, info)
+                datas = PADRAO_DATA_NUMERICA.findall(info)
 
                 cronograma['fases'].append({
                     'nome': fase.strip(),
@@ -190,20 +256,14 @@ class EditalNLPAnalyzer:
                 })
 
         # Datas importantes específicas
-        padroes_datas = {
-            'inscricoes_inicio': r'inscrições.*?de\s*(\d{1,2}[/\-]\d{1,2}[/\-]\d{4})',
-            'inscricoes_fim': r'até\s*(\d{1,2}[/\-]\d{1,2}[/\-]\d{4})',
-            'resultado': r'resultado.*?(\d{1,2}[/\-]\d{1,2}[/\-]\d{4})'
-        }
-
-        for chave, padrao in padroes_datas.items():
-            match = re.search(padrao, texto, re.IGNORECASE)
+        for chave, padrao in PADROES_DATAS_IMPORTANTES.items():
+            match = padrao.search(documento.texto)
             if match:
                 cronograma['datas_importantes'][chave] = match.group(1)
 
         return cronograma
 
-    def classificar_relevancia_unirv(self, texto: str) -> Dict:
+    def classificar_relevancia_unirv(self, texto: Union[str, EditalDocument]) -> Dict:
         """
         Classifica relevância do edital para UniRV
         """
@@ -215,38 +275,27 @@ class EditalNLPAnalyzer:
             'recomendacao': ''
         }
 
-        # Áreas de interesse da UniRV
-        areas_unirv = {
-            'agronomia': ['agricultura', 'agronomia', 'rural', 'agropecuária'],
-            'saude': ['saúde', 'medicina', 'enfermagem', 'farmácia'],
-            'tecnologia': ['tecnologia', 'inovação', 'software', 'ti'],
-            'educacao': ['educação', 'ensino', 'pedagógico'],
-            'meio_ambiente': ['ambiente', 'sustentabilidade']
-        }
-
-        texto_lower = texto.lower()
+        # Áreas, público e termos de complexidade numa única passada. O texto
+        # do HTML do edital vai direto: montar um EditalDocument (normalização,
+        # índice de seções) só para ler .texto seria trabalho perdido
+        if isinstance(texto, EditalDocument):
+            texto = texto.texto
+        ocorrencias = TAXONOMIA_RELEVANCIA.ocorrencias(texto)
 
         # Verificar áreas
-        for area, palavras in areas_unirv.items():
-            if any(palavra in texto_lower for palavra in palavras):
+        for area in TAXONOMIA_RELEVANCIA.dimensoes['areas']:
+            if area in ocorrencias['areas']:
                 score['areas_interesse'].append(area)
                 score['score_total'] += 20
 
         # Público UniRV
-        if 'docente' in texto_lower or 'professor' in texto_lower:
-            score['publico_unirv'].append('docentes')
-            score['score_total'] += 15
-
-        if 'estudante' in texto_lower or 'aluno' in texto_lower:
-            score['publico_unirv'].append('estudantes')
-            score['score_total'] += 15
-
-        if 'universidade' in texto_lower or 'ict' in texto_lower:
-            score['publico_unirv'].append('instituicao')
-            score['score_total'] += 10
+        for publico, peso in PESOS_PUBLICO_UNIRV.items():
+            if publico in ocorrencias['publico']:
+                score['publico_unirv'].append(publico)
+                score['score_total'] += peso
 
         # Avaliar complexidade
-        requisitos = len(re.findall(r'requisito|condição|exigência', texto_lower))
+        requisitos = ocorrencias['complexidade'].get('requisitos', 0)
         if requisitos > 10:
             score['complexidade'] = 'alta'
         elif requisitos < 5:
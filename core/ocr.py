@@ -0,0 +1,353 @@
+import multiprocessing
+import os
+import re
+import string
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from config.config import Config
+from core.pdf_backends import PaginaPDF
+
+try:
+    import pytesseract
+    from pdf2image import convert_from_path, pdfinfo_from_path
+    from PIL import Image, ImageEnhance
+
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+OCR_LANG = 'por'
+OCR_CONFIG = '--psm 6'
+
+# Caracteres esperados num edital; fontes sem tabela de Unicode viram
+# '�', "(cid:N)", área de uso privado ou símbolos aleatórios
+CARACTERES_LEGIVEIS = frozenset(
+    string.ascii_letters + string.digits + string.punctuation
+    + 'áàâãéêíóôõúüçÁÀÂÃÉÊÍÓÔÕÚÜÇ' + 'ºª°§–—“”‘’•…€'
+)
+PROPORCAO_MINIMA_LEGIVEL = 0.7
+PADRAO_CID = re.compile(r'\(cid:\d+\)')
+
+
+class ResultadoOCR(NamedTuple):
+    texto: str
+    confianca: Optional[float]  # média da confiança (0-100) das palavras; None sem palavras
+    dpi: Optional[int] = None  # resolução em que a página foi rasterizada
+    falhou: bool = False  # erro no OCR (texto vazio não quer dizer página em branco)
+
+
+def preprocessar_imagem(imagem: 'Image.Image') -> 'Image.Image':
+    """Melhora qualidade da imagem para OCR"""
+    # Escala de cinza
+    imagem = imagem.convert('L')
+
+    # Aumentar contraste
+    enhancer = ImageEnhance.Contrast(imagem)
+    imagem = enhancer.enhance(2)
+
+    # Aumentar nitidez
+    enhancer = ImageEnhance.Sharpness(imagem)
+    imagem = enhancer.enhance(1.5)
+
+    return imagem
+
+
+def _texto_e_confianca(dados: Dict[str, list]) -> ResultadoOCR:
+    """Texto (linhas e parágrafos como no image_to_string) e confiança média do image_to_data"""
+    linhas = []
+    confiancas = []
+    anterior = None
+
+    for i, palavra in enumerate(dados['text']):
+        palavra = palavra.strip()
+        if not palavra:
+            continue
+
+        confianca = float(dados['conf'][i])
+        if confianca >= 0:
+            confiancas.append(confianca)
+
+        linha = (dados['block_num'][i], dados['par_num'][i], dados['line_num'][i])
+        if linha == anterior:
+            linhas[-1] += ' ' + palavra
+            continue
+
+        if anterior is not None and linha[:2] != anterior[:2]:
+            linhas.append('')
+        linhas.append(palavra)
+        anterior = linha
+
+    texto = '\n'.join(linhas) + '\n' if linhas else ''
+    return ResultadoOCR(texto, sum(confiancas) / len(confiancas) if confiancas else None)
+
+
+def ocr_pagina(imagem: Union[str, 'Image.Image']) -> ResultadoOCR:
+    """
+    OCR de uma página já rasterizada (roda nos processos do pool)
+
+    Usa image_to_data, que traz a confiança de cada palavra junto com o
+    texto, numa única execução do tesseract.
+
+    Args:
+        imagem: imagem ou caminho do arquivo gerado por rasterizar_paginas;
+            pelo caminho, só o processo que faz o OCR carrega a imagem
+    """
+    if isinstance(imagem, str):
+        with Image.open(imagem) as arquivo:
+            return ocr_pagina(arquivo)
+
+    return _texto_e_confianca(pytesseract.image_to_data(
+        preprocessar_imagem(imagem),
+        lang=OCR_LANG,
+        config=OCR_CONFIG,
+        output_type=pytesseract.Output.DICT
+    ))
+
+
+def proporcao_legivel(texto: str) -> float:
+    """Fração dos caracteres visíveis que são letras, dígitos ou pontuação comuns"""
+    visiveis = [c for c in PADRAO_CID.sub('�', texto) if not c.isspace()]
+    if not visiveis:
+        return 1.0
+    return sum(c in CARACTERES_LEGIVEIS for c in visiveis) / len(visiveis)
+
+
+def pagina_precisa_ocr(pagina: PaginaPDF, minimo_caracteres: int) -> bool:
+    """
+    Decide, página a página, se a camada de texto serve ou se é preciso OCR
+
+    - texto ilegível (fonte sem mapeamento de Unicode): OCR
+    - texto com pelo menos `minimo_caracteres` visíveis: camada de texto
+    - pouco ou nenhum texto e imagens (digitalizada, talvez com um
+      carimbo ou cabeçalho digital): OCR
+    - texto desenhado com fontes mas camada de texto vazia (glifos sem
+      Unicode extraível): OCR
+    - backend que não informa fontes nem imagens: OCR, por garantia
+    - nada disso: página em branco ou de poucas palavras, e o OCR não
+      acharia nada além delas
+    """
+    caracteres = sum(not c.isspace() for c in pagina.texto)
+    if caracteres and proporcao_legivel(pagina.texto) < PROPORCAO_MINIMA_LEGIVEL:
+        return True
+    if caracteres >= minimo_caracteres:
+        return False
+    if pagina.imagens:
+        return True
+    if pagina.fontes and not caracteres:
+        return True
+    return pagina.imagens is None and pagina.fontes is None
+
+
+def tentar_ocr_pagina(imagem: Union[str, 'Image.Image'], numero: int) -> ResultadoOCR:
+    """ocr_pagina na thread atual; com erro, a página volta vazia e as demais seguem"""
+    try:
+        return ocr_pagina(imagem)
+    except Exception as e:
+        print(f"    Erro no OCR da página {numero}: {e}")
+        return ResultadoOCR('', None, falhou=True)
+
+
+def contar_paginas(caminho_pdf: str) -> int:
+    return int(pdfinfo_from_path(caminho_pdf)['Pages'])
+
+
+def _janelas(paginas: Sequence[int], janela: int) -> Iterator[Tuple[int, int]]:
+    """Intervalos (primeira, última) de páginas consecutivas, com até `janela` páginas"""
+    primeira = ultima = None
+    for numero in paginas:
+        if primeira is not None and numero == ultima + 1 and numero - primeira < janela:
+            ultima = numero
+            continue
+        if primeira is not None:
+            yield primeira, ultima
+        primeira = ultima = numero
+
+    if primeira is not None:
+        yield primeira, ultima
+
+
+def rasterizar_paginas(
+        caminho_pdf: str,
+        pasta: str,
+        dpi: int,
+        janela: int,
+        paginas: Optional[Sequence[int]] = None
+) -> Iterator[str]:
+    """
+    Caminhos das imagens das páginas, na ordem, rasterizadas aos poucos
+
+    O pdftoppm roda em janelas de até `janela` páginas consecutivas
+    (first_page/last_page) e grava em `pasta` (paths_only): a próxima
+    janela só é gerada quando o consumidor pede a página seguinte, e
+    nenhuma imagem passa pela memória do processo principal. As páginas
+    saem em tons de cinza, que é o que o OCR usa, com um terço do tamanho
+    em disco.
+
+    Args:
+        paginas: números das páginas (a partir de 1, em ordem crescente);
+            None para todas
+    """
+    if paginas is None:
+        paginas = range(1, contar_paginas(caminho_pdf) + 1)
+
+    for primeira, ultima in _janelas(paginas, janela):
+        yield from convert_from_path(
+            caminho_pdf,
+            dpi=dpi,
+            first_page=primeira,
+            last_page=ultima,
+            output_folder=pasta,
+            grayscale=True,
+            paths_only=True
+        )
+
+
+def configurar_tesseract(tesseract_cmd: Optional[str]):
+    """Executável do tesseract (Config.TESSERACT_CMD); None mantém o do PATH"""
+    if tesseract_cmd and OCR_AVAILABLE:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _iniciar_processo_ocr(tesseract_cmd: Optional[str]):
+    # Um núcleo por tesseract: o paralelismo vem das páginas. Sem o limite,
+    # o OpenMP do tesseract abre uma thread por núcleo em cada processo e
+    # os processos disputam a CPU entre si
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    configurar_tesseract(tesseract_cmd)
+
+
+class PoolOCR:
+    """
+    OCR de páginas em paralelo, num pool de processos compartilhado
+
+    Cada página vai para um processo (tesseract é CPU puro e single-core
+    com OMP_THREAD_LIMIT=1). Como o pool é um só por processo principal
+    (ver obter_pool_ocr), `workers` é o teto de tesseracts simultâneos
+    somando todos os documentos em processamento; as páginas de
+    documentos diferentes dividem as mesmas vagas. Um semáforo limita as
+    páginas enviadas e ainda não terminadas, e cada chamada de
+    ocr_paginas recolhe os textos prontos enquanto envia as próximas, para
+    que documentos grandes não encham a fila do pool de imagens.
+    """
+
+    def __init__(self, workers: int, tesseract_cmd: Optional[str] = None):
+        self.workers = workers
+        self.tesseract_cmd = tesseract_cmd
+        self._lock = threading.Lock()
+        self._executor = self._criar_executor()
+        self._vagas = threading.BoundedSemaphore(workers * 2)
+
+    def _criar_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_iniciar_processo_ocr,
+            initargs=(self.tesseract_cmd,)
+        )
+
+    def _renovar(self, quebrado: ProcessPoolExecutor):
+        """Troca o executor quebrado (processo morto) por um novo, uma vez só entre as threads"""
+        with self._lock:
+            if self._executor is quebrado:
+                print("    Pool de OCR quebrado, recriando os processos")
+                quebrado.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._criar_executor()
+
+    def _enviar(self, imagem) -> Tuple[Future, ProcessPoolExecutor]:
+        self._vagas.acquire()
+        executor = self._executor
+        try:
+            future = executor.submit(ocr_pagina, imagem)
+        except BaseException:
+            self._vagas.release()
+            raise
+        future.add_done_callback(lambda _: self._vagas.release())
+        return future, executor
+
+    def _enviar_ou_renovar(self, imagem) -> Tuple[Optional[Future], Optional[ProcessPoolExecutor]]:
+        for _ in range(2):
+            try:
+                return self._enviar(imagem)
+            except BrokenProcessPool:
+                self._renovar(self._executor)
+        return None, None
+
+    def _coletar(
+            self,
+            numero: int,
+            imagem,
+            future: Optional[Future],
+            executor: Optional[ProcessPoolExecutor],
+            apagar: bool
+    ) -> ResultadoOCR:
+        try:
+            if future is None:
+                raise BrokenProcessPool()
+            return future.result()
+        except BrokenProcessPool:
+            if executor is not None:
+                self._renovar(executor)
+            print(f"    Pool de OCR indisponível, página {numero} na thread atual")
+            return tentar_ocr_pagina(imagem, numero)
+        except Exception as e:
+            print(f"    Erro no OCR da página {numero}: {e}")
+            return ResultadoOCR('', None, falhou=True)
+        finally:
+            if apagar:
+                os.remove(imagem)
+
+    def ocr_paginas(
+            self,
+            paginas: Iterable[Tuple[int, Union[str, 'Image.Image']]],
+            apagar: bool = False
+    ) -> List[ResultadoOCR]:
+        """
+        Texto e confiança de cada página, na ordem recebida
+
+        Páginas com erro voltam vazias; se o pool quebrar (processo morto),
+        as páginas afetadas são refeitas na thread atual e as seguintes vão
+        para um pool novo.
+
+        Args:
+            paginas: pares (número da página no PDF, imagem ou caminho - ver
+                rasterizar_paginas); o número só aparece nas mensagens de
+                erro. Pode ser um gerador, consumido só à medida que há
+                vaga no pool
+            apagar: apaga o arquivo de cada página assim que o texto dela
+                fica pronto (imagens dadas por caminho)
+        """
+        pendentes = deque()
+        textos = []
+
+        for numero, imagem in paginas:
+            while len(pendentes) >= self.workers * 2:
+                textos.append(self._coletar(*pendentes.popleft(), apagar))
+
+            pendentes.append((numero, imagem, *self._enviar_ou_renovar(imagem)))
+
+        while pendentes:
+            textos.append(self._coletar(*pendentes.popleft(), apagar))
+
+        return textos
+
+    def fechar(self):
+        with self._lock:
+            self._executor.shutdown()
+
+
+_pool_compartilhado = None
+_lock_pool = threading.Lock()
+
+
+def obter_pool_ocr(config: Config) -> PoolOCR:
+    """Pool de OCR único do processo (Config.OCR_WORKERS processos)"""
+    global _pool_compartilhado
+
+    with _lock_pool:
+        if _pool_compartilhado is None:
+            _pool_compartilhado = PoolOCR(config.OCR_WORKERS, config.TESSERACT_CMD)
+        return _pool_compartilhado
@@ -0,0 +1,285 @@
+import abc
+import io
+import json
+import os
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from utils.arquivos import mapear_arquivo
+
+try:
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+except ImportError:
+    pdfium = None
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+try:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTChar, LTFigure, LTImage, LTTextContainer
+except ImportError:
+    extract_pages = None
+
+
+class PaginaPDF(NamedTuple):
+    texto: str
+    fontes: Optional[bool]  # a página desenha texto com fontes (None: backend não informa)
+    imagens: Optional[bool]  # a página desenha imagens (None: backend não informa)
+
+
+@contextmanager
+def _abrir(pdf: Union[str, bytes]):
+    """Arquivo para os leitores em Python puro: mmap do caminho ou BytesIO"""
+    if isinstance(pdf, bytes):
+        yield io.BytesIO(pdf)
+    else:
+        with mapear_arquivo(pdf) as mapa:
+            yield mapa
+
+
+class BackendPDF(abc.ABC):
+    """
+    Extração de texto de PDF, página por página
+
+    paginas() é um gerador: quem para no meio (orçamento de CPU, janela de
+    páginas) deve fechá-lo, por exemplo com contextlib.closing, para liberar
+    o arquivo na hora.
+    """
+
+    nome = ''
+
+    @property
+    @abc.abstractmethod
+    def disponivel(self) -> bool:
+        """Biblioteca do backend instalada"""
+
+    @abc.abstractmethod
+    def paginas(self, pdf: Union[str, bytes]) -> Iterator[str]:
+        """Texto de cada página (pdf: caminho do arquivo ou bytes)"""
+
+    def analisar_paginas(self, pdf: Union[str, bytes]) -> Iterator[PaginaPDF]:
+        """Texto de cada página e se ela tem fontes e imagens (para decidir o OCR)"""
+        for texto in self.paginas(pdf):
+            yield PaginaPDF(texto, None, None)
+
+
+# Operadores que mostram texto (Tj, TJ, ', ") logo após uma string ou array;
+# BT/ET sozinhos não bastam (o reportlab abre toda página com um BT vazio)
+PADRAO_MOSTRA_TEXTO = re.compile(rb'[)>\]]\s*(?:Tj|TJ|\'|")')
+
+
+def _desenha_texto(conteudo) -> bool:
+    """O content stream mostra algum texto"""
+    return conteudo is not None and PADRAO_MOSTRA_TEXTO.search(conteudo.get_data()) is not None
+
+
+def _recursos_pypdf(recursos, conteudo, profundidade: int = 0) -> Tuple[bool, bool]:
+    """
+    (fontes, imagens) de um dicionário /Resources e seu content stream,
+    entrando em XObjects de formulário
+
+    Fontes declaradas não bastam: geradores como o reportlab compartilham
+    um /Resources com fontes entre todas as páginas, inclusive as em
+    branco; conta só se o conteúdo desenha texto.
+    """
+    fontes = '/Font' in recursos and len(recursos['/Font']) > 0 and _desenha_texto(conteudo)
+    imagens = False
+
+    if '/XObject' in recursos:
+        xobjects = recursos['/XObject']
+        for nome in xobjects:
+            xobject = xobjects[nome]
+            subtipo = xobject.get('/Subtype')
+            if subtipo == '/Image':
+                imagens = True
+            elif subtipo == '/Form' and profundidade < 2 and '/Resources' in xobject:
+                outras_fontes, outras_imagens = _recursos_pypdf(xobject['/Resources'], xobject, profundidade + 1)
+                fontes, imagens = fontes or outras_fontes, imagens or outras_imagens
+
+    return fontes, imagens
+
+
+class BackendPyPDF(BackendPDF):
+    """pypdf ou seu antecessor PyPDF2 (mesma API, Python puro)"""
+
+    def __init__(self, nome: str, modulo):
+        self.nome = nome
+        self.modulo = modulo
+
+    @property
+    def disponivel(self) -> bool:
+        return self.modulo is not None
+
+    def paginas(self, pdf: Union[str, bytes]) -> Iterator[str]:
+        with _abrir(pdf) as arquivo:
+            for pagina in self.modulo.PdfReader(arquivo).pages:
+                yield pagina.extract_text() or ''
+
+    def analisar_paginas(self, pdf: Union[str, bytes]) -> Iterator[PaginaPDF]:
+        with _abrir(pdf) as arquivo:
+            for pagina in self.modulo.PdfReader(arquivo).pages:
+                try:
+                    if '/Resources' in pagina:
+                        fontes, imagens = _recursos_pypdf(pagina['/Resources'], pagina.get_contents())
+                    else:
+                        fontes, imagens = False, False
+                except Exception:
+                    fontes = imagens = None
+                yield PaginaPDF(pagina.extract_text() or '', fontes, imagens)
+
+
+class BackendPdfminer(BackendPDF):
+    """pdfminer.six: análise de layout completa, o mais lento e o mais fiel à ordem de leitura"""
+
+    nome = 'pdfminer'
+
+    @property
+    def disponivel(self) -> bool:
+        return extract_pages is not None
+
+    def paginas(self, pdf: Union[str, bytes]) -> Iterator[str]:
+        for pagina in self.analisar_paginas(pdf):
+            yield pagina.texto
+
+    @staticmethod
+    def _conteudo_figura(figura) -> Tuple[bool, bool]:
+        """(fontes, imagens) dentro de uma figura (XObject), que pode conter outras"""
+        fontes = imagens = False
+        for elemento in figura:
+            if isinstance(elemento, LTImage):
+                imagens = True
+            elif isinstance(elemento, LTChar):
+                fontes = True
+            elif isinstance(elemento, LTFigure):
+                outras_fontes, outras_imagens = BackendPdfminer._conteudo_figura(elemento)
+                fontes, imagens = fontes or outras_fontes, imagens or outras_imagens
+        return fontes, imagens
+
+    def analisar_paginas(self, pdf: Union[str, bytes]) -> Iterator[PaginaPDF]:
+        # Exige um arquivo de verdade (não aceita mmap): caminho ou BytesIO
+        for layout in extract_pages(io.BytesIO(pdf) if isinstance(pdf, bytes) else pdf):
+            textos = []
+            fontes = imagens = False
+            for elemento in layout:
+                if isinstance(elemento, LTTextContainer):
+                    textos.append(elemento.get_text())
+                    fontes = True
+                elif isinstance(elemento, LTImage):
+                    imagens = True
+                elif isinstance(elemento, LTFigure):
+                    outras_fontes, outras_imagens = self._conteudo_figura(elemento)
+                    fontes, imagens = fontes or outras_fontes, imagens or outras_imagens
+            yield PaginaPDF(''.join(textos), fontes, imagens)
+
+
+class BackendPdfium(BackendPDF):
+    """pypdfium2: bindings do PDFium (C++), de longe o mais rápido"""
+
+    nome = 'pypdfium2'
+
+    @property
+    def disponivel(self) -> bool:
+        return pdfium is not None
+
+    def paginas(self, pdf: Union[str, bytes]) -> Iterator[str]:
+        for pagina in self.analisar_paginas(pdf, recursos=False):
+            yield pagina.texto
+
+    def analisar_paginas(self, pdf: Union[str, bytes], recursos: bool = True) -> Iterator[PaginaPDF]:
+        # O PDFium lê o arquivo direto do disco, sem passar pelo Python
+        documento = pdfium.PdfDocument(pdf)
+        try:
+            for indice in range(len(documento)):
+                pagina = documento[indice]
+                texto = pagina.get_textpage()
+                try:
+                    fontes = imagens = None
+                    if recursos:
+                        fontes = imagens = False
+                        objetos = pagina.get_objects(
+                            filter=[pdfium_c.FPDF_PAGEOBJ_TEXT, pdfium_c.FPDF_PAGEOBJ_IMAGE],
+                            max_depth=2
+                        )
+                        for objeto in objetos:
+                            if objeto.type == pdfium_c.FPDF_PAGEOBJ_TEXT:
+                                fontes = True
+                            else:
+                                imagens = True
+                            if fontes and imagens:
+                                break
+                    yield PaginaPDF(texto.get_text_range(), fontes, imagens)
+                finally:
+                    texto.close()
+                    pagina.close()
+        finally:
+            documento.close()
+
+
+# Ordem de preferência do modo 'auto' quando não há ranking medido por
+# benchmarks/bench_pdf_backends.py: do mais rápido ao mais lento nos editais
+# de teste (pypdfium2 ~3x o PyPDF2, que por sua vez ~2x o pypdf)
+BACKENDS: Dict[str, BackendPDF] = {
+    backend.nome: backend for backend in (
+        BackendPdfium(),
+        BackendPyPDF('PyPDF2', PyPDF2),
+        BackendPyPDF('pypdf', pypdf),
+        BackendPdfminer()
+    )
+}
+
+
+def backends_disponiveis() -> List[str]:
+    return [nome for nome, backend in BACKENDS.items() if backend.disponivel]
+
+
+def ler_ranking(arquivo: Optional[str]) -> List[str]:
+    """Backends do mais rápido ao mais lento, como medidos no benchmark"""
+    if not arquivo or not os.path.exists(arquivo):
+        return []
+
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            return [nome for nome in json.load(f).get('ranking', []) if nome in BACKENDS]
+    except (OSError, ValueError) as e:
+        print(f"Ranking de backends de PDF ilegível ({arquivo}): {e}")
+        return []
+
+
+def obter_backend(nome: str = 'auto', arquivo_ranking: Optional[str] = None) -> Optional[BackendPDF]:
+    """
+    Backend de extração de texto
+
+    Args:
+        nome: 'auto' ou um dos BACKENDS
+        arquivo_ranking: JSON gravado pelo benchmark; no modo 'auto', vale
+            o primeiro backend instalado do ranking e, sem ele, o primeiro
+            da ordem de BACKENDS
+
+    Returns:
+        None se nenhuma biblioteca de PDF estiver instalada
+    """
+    if nome != 'auto':
+        if nome not in BACKENDS:
+            raise ValueError(f"Backend de PDF desconhecido: {nome} (opções: auto, {', '.join(BACKENDS)})")
+        if BACKENDS[nome].disponivel:
+            return BACKENDS[nome]
+        print(f"AVISO: backend de PDF '{nome}' não instalado, escolhendo automaticamente")
+
+    disponiveis = backends_disponiveis()
+    for candidato in ler_ranking(arquivo_ranking) + disponiveis:
+        if candidato in disponiveis:
+            return BACKENDS[candidato]
+
+    print("AVISO: nenhuma biblioteca de PDF instalada")
+    print("Instale: pip install pypdfium2 (ou pypdf, PyPDF2, pdfminer.six)")
+    return None
@@ -1,9 +1,56 @@
-import requests
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+from contextlib import ExitStack, closing
 from datetime import datetime
-import PyPDF2
-import io
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import requests
+
+from config.config import Config
+from core import motor_extracao
+from core.motor_extracao import JANELA_SECAO, PADRAO_ITEM_LISTA
+from core.documento import EditalDocument, juntar_paginas
+from core.pdf_backends import obter_backend
+from core.taxonomia import Taxonomia
+from utils.document_store import DocumentStore, obter_document_store
+from utils.http_client import ConteudoInesperado, HTTPClient, obter_cliente_http
+from utils.processos import OrcamentoCPU, TempoEsgotado, limite_tempo
+
+TAXONOMIA_PDF = Taxonomia({
+    'publico_alvo': {
+        'Pesquisadores': ['pesquisador', 'docente', 'professor'],
+        'Estudantes': ['estudante', 'aluno', 'graduação', 'mestrado', 'doutorado'],
+        'Empresas': ['empresa', 'CNPJ', 'MEI', 'startup'],
+        'ICTs': ['ICT', 'instituição de ciência', 'universidade'],
+        'ONGs': ['ONG', 'organização não governamental', 'terceiro setor'],
+        'Empreendedores': ['empreendedor', 'inovador']
+    },
+    'areas_tematicas': {
+        'Saúde': ['saúde', 'medicina', 'farmácia', 'enfermagem'],
+        'Tecnologia': ['tecnologia', 'TI', 'informática', 'software'],
+        'Agricultura': ['agricultura', 'agropecuária', 'rural', 'agronomia'],
+        'Energia': ['energia', 'energético', 'solar', 'eólica', 'renovável'],
+        'Meio Ambiente': ['ambiente', 'sustentabilidade', 'ecologia'],
+        'Educação': ['educação', 'ensino', 'pedagógico'],
+        'Inovação': ['inovação', 'startup', 'empreendedorismo'],
+        'Ciências Sociais': ['social', 'humanas', 'sociologia'],
+        'Engenharia': ['engenharia', 'construção', 'infraestrutura']
+    }
+})
+
+# Seções de requisitos quando o PDF não tem títulos numerados: da palavra
+# até uma linha que começa com letra, em no máximo JANELA_SECAO caracteres.
+# Com str.find e uma busca limitada, o custo é linear mesmo em saídas de OCR
+# sem quebras de linha (um .*? com DOTALL e lookahead varria até o fim)
+PALAVRAS_SECAO_REQUISITOS = ('requisito', 'critério', 'condições')
+PADRAO_FIM_SECAO = re.compile(r'\n[a-z]', re.IGNORECASE)
+
+TITULOS_REQUISITOS = ('requisito', 'critério', 'condiç', 'elegib')
+TITULOS_DATAS = ('cronograma', 'calendário', 'prazo')
 
 
 class EditalPDFExtractor:
@@ -11,235 +58,357 @@ class EditalPDFExtractor:
     Extrai informações estruturadas de PDFs de editais
     """
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def baixar_pdf(self, url: str) -> Optional[bytes]:
-        """Baixa PDF da URL"""
-        try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return response.content
-        except Exception as e:
-            print(f"Erro ao baixar PDF {url}: {e}")
-            return None
+    # Tipos de resultado guardados por hash no DocumentStore
+    RESULTADO_TEXTO = 'texto'
+    RESULTADO_EDITAL = 'edital_pdf'
+
+    # Resultado de URLs que não servem um PDF (formulários .docx, páginas
+    # HTML...): vai para o cache por URL, que não as baixa de novo
+    NAO_PDF = {'nao_pdf': True}
+
+    # Idem para links mortos (404, 410...), gravados como {'status_http': 404}.
+    # Estes 4xx são transitórios e, como 5xx e erros de rede, dão resultado
+    # vazio (nova tentativa na próxima execução)
+    STATUS_TRANSITORIOS = (408, 425, 429)
+
+    def __init__(
+            self,
+            config: Optional[Config] = None,
+            http_client: Optional[HTTPClient] = None,
+            document_store: Optional[DocumentStore] = None
+    ):
+        """
+        Args:
+            config: configurações (padrão Config())
+            http_client: cliente HTTP (padrão: o compartilhado)
+            document_store: repositório por conteúdo (padrão: o compartilhado,
+                se Config.USE_DOCUMENT_STORE); False desativa
+        """
+        self.config = config or Config()
+        self._http = http_client
+        self.backend = obter_backend(self.config.PDF_BACKEND, self.config.PDF_BACKEND_RANKING)
+
+        # Downloads simultâneos (Config.PDF_WORKERS), independente de quantas
+        # threads chamam processar_edital para esperar a extração
+        self._downloads = threading.BoundedSemaphore(self.config.PDF_WORKERS)
+
+        # PDFs idênticos em URLs diferentes são processados uma vez só
+        if document_store is None and self.config.USE_DOCUMENT_STORE:
+            document_store = obter_document_store(self.config)
+        self.store = document_store or None
+
+    @property
+    def http(self) -> HTTPClient:
+        # Criado só no primeiro download: os processos de extração não usam rede
+        if not self._http:
+            self._http = obter_cliente_http(self.config)
+        return self._http
+
+    def baixar_pdf(self, url: str):
+        """
+        Baixa o PDF em stream para disco (ver HTTPClient.baixar_arquivo);
+        respostas sem a assinatura %PDF são interrompidas no primeiro bloco.
+        Com DocumentStore, o PDF é guardado nele já no download
+
+            with extrator.baixar_pdf(url) as caminho:
+                texto = extrator.extrair_texto_pdf(caminho)
+        """
+        return self.http.baixar_arquivo(url, assinatura=b'%PDF', repositorio=self.store)
+
+    @staticmethod
+    def eh_pdf(caminho: str) -> bool:
+        """Assinatura %PDF no início do arquivo (anexos podem ser .docx, HTML...)"""
+        with open(caminho, 'rb') as f:
+            return b'%PDF' in f.read(1024)
+
+    def extrair_texto_pdf(self, pdf: Union[str, bytes], orcamento: Optional[OrcamentoCPU] = None) -> str:
+        """
+        Extrai texto do PDF (caminho do arquivo, lido via mmap, ou bytes),
+        com as páginas separadas por documento.QUEBRA_PAGINA
+
+        Com orcamento, para de ler páginas quando ele se esgota. A
+        biblioteca usada é a de Config.PDF_BACKEND (ver core.pdf_backends).
+        """
+        if not self.backend:
+            return ""
 
-    def extrair_texto_pdf(self, pdf_bytes: bytes) -> str:
-        """Extrai texto do PDF"""
         try:
-            pdf_file = io.BytesIO(pdf_bytes)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-
-            texto = ""
-            for page in pdf_reader.pages:
-                texto += page.extract_text() + "\n"
-
-            return texto
+            paginas = []
+            with closing(self.backend.paginas(pdf)) as leitor:
+                for texto in leitor:
+                    if orcamento and orcamento.esgotado():
+                        print(f"  Orçamento de CPU esgotado: {len(paginas)} páginas lidas")
+                        break
+                    paginas.append(texto)
+
+            return juntar_paginas(paginas)
         except Exception as e:
-            print(f"Erro ao extrair texto do PDF: {e}")
+            print(f"Erro ao extrair texto do PDF ({self.backend.nome}): {e}")
             return ""
 
-    def extrair_valores(self, texto: str) -> Dict:
-        """Extrai informações sobre valores/recursos do edital"""
-        valores = {
-            'valor_total': None,
-            'valor_por_projeto': None,
-            'quantidade_projetos': None,
-            'contrapartida': None
-        }
+    # Os extratores aceitam o texto do PDF ou um EditalDocument já montado;
+    # analisar_texto monta o documento uma vez e o repassa a todos
 
-        # Padrões para valores em reais
-        padroes_valor = [
-            r'R\$\s*([\d.,]+(?:\.\d{3})*(?:,\d{2})?)',
-            r'valor\s+total[:\s]+R\$\s*([\d.,]+)',
-            r'recursos?\s+de\s+R\$\s*([\d.,]+)',
-            r'montante\s+de\s+R\$\s*([\d.,]+)'
-        ]
+    def extrair_valores(self, texto: Union[str, EditalDocument]) -> Dict:
+        """Extrai informações sobre valores/recursos do edital"""
+        documento = EditalDocument.obter(texto)
+        return motor_extracao.extrair_valores(documento.tokens, documento.texto)
 
-        for padrao in padroes_valor:
-            matches = re.finditer(padrao, texto, re.IGNORECASE)
-            for match in matches:
-                valor_str = match.group(1)
-                # Converte formato brasileiro para número
-                valor = float(valor_str.replace('.', '').replace(',', '.'))
-                if not valores['valor_total'] or valor > valores['valor_total']:
-                    valores['valor_total'] = valor
-
-        # Quantidade de projetos
-        match_projetos = re.search(r'até\s+(\d+)\s+projetos?', texto, re.IGNORECASE)
-        if match_projetos:
-            valores['quantidade_projetos'] = int(match_projetos.group(1))
-
-        # Contrapartida
-        if re.search(r'contrapartida', texto, re.IGNORECASE):
-            match_contrapartida = re.search(
-                r'contrapartida[^\d]*([\d.,]+\s*%|R\$\s*[\d.,]+)',
-                texto,
-                re.IGNORECASE
-            )
-            if match_contrapartida:
-                valores['contrapartida'] = match_contrapartida.group(1)
-
-        return valores
-
-    def extrair_datas(self, texto: str) -> Dict:
+    def extrair_datas(self, texto: Union[str, EditalDocument]) -> Dict:
         """Extrai datas importantes do edital"""
-        datas = {
-            'inscricoes_inicio': None,
-            'inscricoes_fim': None,
-            'resultado_preliminar': None,
-            'resultado_final': None,
-            'execucao_inicio': None,
-            'execucao_fim': None
-        }
+        documento = EditalDocument.obter(texto)
 
-        # Padrões de data
-        padroes_data = [
-            r'(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})',
-            r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(\d{4})'
+        # Com seções numeradas de cronograma, só os tokens delas
+        secoes = [
+            documento.tokens_em(secao.inicio, secao.fim)
+            for secao in documento.secoes_com(*TITULOS_DATAS)
         ]
 
-        meses = {
-            'janeiro': '01', 'fevereiro': '02', 'março': '03', 'abril': '04',
-            'maio': '05', 'junho': '06', 'julho': '07', 'agosto': '08',
-            'setembro': '09', 'outubro': '10', 'novembro': '11', 'dezembro': '12'
-        }
+        return motor_extracao.extrair_datas(documento.tokens, documento.texto, secoes or None)
 
-        # Buscar seções de cronograma
-        secoes_cronograma = [
-            r'cronograma.*?(?=\n\n|\Z)',
-            r'calendário.*?(?=\n\n|\Z)',
-            r'prazo.*?(?=\n\n|\Z)'
-        ]
+    def classificar(self, texto: Union[str, EditalDocument]) -> Dict[str, List[str]]:
+        """Público-alvo e áreas temáticas numa única passada pelo texto"""
+        classes = TAXONOMIA_PDF.classificar(EditalDocument.obter(texto).texto)
 
-        texto_cronograma = ""
-        for padrao in secoes_cronograma:
-            match = re.search(padrao, texto, re.IGNORECASE | re.DOTALL)
-            if match:
-                texto_cronograma += match.group(0) + "\n"
-
-        # Extrair datas de inscrição
-        match_inscricao = re.search(
-            r'inscrições?[^\d]*([\d/]+)\s+(?:a|até|e)\s+([\d/]+)',
-            texto_cronograma or texto,
-            re.IGNORECASE
-        )
-        if match_inscricao:
-            datas['inscricoes_inicio'] = match_inscricao.group(1)
-            datas['inscricoes_fim'] = match_inscricao.group(2)
-
-        # Extrair data de resultado
-        match_resultado = re.search(
-            r'resultado\s+(?:preliminar|parcial)[^\d]*([\d/]+)',
-            texto_cronograma or texto,
-            re.IGNORECASE
-        )
-        if match_resultado:
-            datas['resultado_preliminar'] = match_resultado.group(1)
-
-        match_resultado_final = re.search(
-            r'resultado\s+final[^\d]*([\d/]+)',
-            texto_cronograma or texto,
-            re.IGNORECASE
-        )
-        if match_resultado_final:
-            datas['resultado_final'] = match_resultado_final.group(1)
-
-        return datas
-
-    def extrair_publico_alvo(self, texto: str) -> List[str]:
-        """Identifica público-alvo do edital"""
-        publico = []
-
-        criterios = {
-            'Pesquisadores': [r'pesquisador', r'docente', r'professor'],
-            'Estudantes': [r'estudante', r'aluno', r'graduação', r'mestrado', r'doutorado'],
-            'Empresas': [r'empresa', r'CNPJ', r'MEI', r'startup'],
-            'ICTs': [r'ICT', r'instituição de ciência', r'universidade'],
-            'ONGs': [r'ONG', r'organização não governamental', r'terceiro setor'],
-            'Empreendedores': [r'empreendedor', r'inovador']
+        return {
+            'publico_alvo': classes['publico_alvo'] or ['Geral'],
+            'areas_tematicas': classes['areas_tematicas'] or ['Multidisciplinar']
         }
 
-        texto_lower = texto.lower()
-
-        for categoria, padroes in criterios.items():
-            if any(re.search(padrao, texto_lower) for padrao in padroes):
-                publico.append(categoria)
-
-        return publico if publico else ['Geral']
+    def extrair_publico_alvo(self, texto: Union[str, EditalDocument]) -> List[str]:
+        """Identifica público-alvo do edital"""
+        return self.classificar(texto)['publico_alvo']
 
-    def extrair_requisitos(self, texto: str) -> List[str]:
+    def extrair_requisitos(self, texto: Union[str, EditalDocument]) -> List[str]:
         """Extrai requisitos principais do edital"""
+        documento = EditalDocument.obter(texto)
         requisitos = []
 
-        # Buscar seção de requisitos
-        secoes = [
-            r'requisitos?.*?(?=\n[A-Z]|\Z)',
-            r'critérios?.*?(?=\n[A-Z]|\Z)',
-            r'condições.*?(?=\n[A-Z]|\Z)'
-        ]
-
-        for padrao in secoes:
-            match = re.search(padrao, texto, re.IGNORECASE | re.DOTALL)
-            if match:
-                secao_texto = match.group(0)
-                # Extrair itens numerados ou com bullets
-                itens = re.findall(r'(?:^|\n)\s*[\d\-•]\s*([^\n]+)', secao_texto)
-                requisitos.extend(itens)
+        # Seções numeradas de requisitos; sem elas, busca no texto inteiro
+        secoes = documento.secoes_com(*TITULOS_REQUISITOS)
+        if secoes:
+            trechos = [documento.corpo(secao) for secao in secoes]
+        else:
+            trechos = []
+            for palavra in PALAVRAS_SECAO_REQUISITOS:
+                inicio = documento.minusculo.find(palavra)
+                if inicio == -1:
+                    continue
+                limite = min(inicio + JANELA_SECAO, len(documento.texto))
+                fim = PADRAO_FIM_SECAO.search(documento.texto, inicio + len(palavra), limite)
+                trechos.append(documento.texto[inicio:fim.start() if fim else limite])
+
+        for trecho in trechos:
+            # Extrair itens numerados ou com bullets
+            requisitos.extend(PADRAO_ITEM_LISTA.findall(trecho))
 
         return requisitos[:10]  # Limitar a 10 principais
 
-    def extrair_areas_tematicas(self, texto: str) -> List[str]:
+    def extrair_areas_tematicas(self, texto: Union[str, EditalDocument]) -> List[str]:
         """Identifica áreas temáticas do edital"""
-        areas_conhecidas = {
-            'Saúde': [r'saúde', r'medicina', r'farmácia', r'enfermagem'],
-            'Tecnologia': [r'tecnologia', r'TI', r'informática', r'software'],
-            'Agricultura': [r'agricultura', r'agropecuária', r'rural', r'agronomia'],
-            'Energia': [r'energia', r'energético', r'solar', r'eólica', r'renovável'],
-            'Meio Ambiente': [r'ambiente', r'sustentabilidade', r'ecologia'],
-            'Educação': [r'educação', r'ensino', r'pedagógico'],
-            'Inovação': [r'inovação', r'startup', r'empreendedorismo'],
-            'Ciências Sociais': [r'social', r'humanas', r'sociologia'],
-            'Engenharia': [r'engenharia', r'construção', r'infraestrutura']
+        return self.classificar(texto)['areas_tematicas']
+
+    def analisar_texto(
+            self,
+            texto: Union[str, EditalDocument],
+            url_pdf: str,
+            orcamento: Optional[OrcamentoCPU] = None
+    ) -> Dict:
+        """
+        Informações estruturadas a partir do texto do PDF (só CPU)
+
+        Valores e datas (motor de tokens, linear) sempre saem. As demais
+        etapas rodam em ordem de importância enquanto houver orçamento de
+        CPU para o documento (padrão Config.PDF_ORCAMENTO_CPU); as que
+        ficarem de fora são listadas em 'etapas_puladas'.
+        """
+        orcamento = orcamento or OrcamentoCPU(self.config.PDF_ORCAMENTO_CPU)
+        documento = EditalDocument.obter(texto)
+
+        resultados = {
+            'valores': self.extrair_valores(documento),
+            'datas': self.extrair_datas(documento)
         }
+        etapas = {
+            'classes': lambda: self.classificar(documento),
+            'requisitos': lambda: self.extrair_requisitos(documento)
+        }
+        for nome, etapa in etapas.items():
+            if orcamento.esgotado():
+                break
+            resultados[nome] = etapa()
 
-        areas = []
-        texto_lower = texto.lower()
+        classes = resultados.get('classes', {})
+        informacoes = {
+            'url_pdf': url_pdf,
+            'valores': resultados.get('valores', {}),
+            'datas': resultados.get('datas', {}),
+            'publico_alvo': classes.get('publico_alvo', []),
+            'requisitos': resultados.get('requisitos', []),
+            'areas_tematicas': classes.get('areas_tematicas', []),
+            'tamanho_texto': len(documento),
+            'numero_paginas': len(documento.paginas)
+        }
 
-        for area, padroes in areas_conhecidas.items():
-            if any(re.search(padrao, texto_lower) for padrao in padroes):
-                areas.append(area)
+        puladas = [nome for nome in etapas if nome not in resultados]
+        if puladas:
+            informacoes['etapas_puladas'] = puladas
+            print(f"  Orçamento de CPU esgotado ({orcamento.gasto():.1f}s), etapas puladas: {', '.join(puladas)}")
 
-        return areas if areas else ['Multidisciplinar']
+        return informacoes
 
-    def processar_edital(self, url_pdf: str) -> Dict:
-        """Processa PDF completo e retorna informações estruturadas"""
+    def extrair_arquivo(self, caminho: str, url_pdf: str) -> Tuple[str, Dict]:
+        """
+        Texto e informações estruturadas do PDF em disco, dentro de um
+        orçamento de CPU (ver analisar_texto)
+        """
+        orcamento = OrcamentoCPU(self.config.PDF_ORCAMENTO_CPU)
+        texto = self.extrair_texto_pdf(caminho, orcamento)
+        if not texto:
+            return texto, {}
+
+        texto_incompleto = orcamento.esgotado()
+        informacoes = self.analisar_texto(texto, url_pdf, orcamento)
+        if texto_incompleto:
+            informacoes['texto_incompleto'] = True
+        return texto, informacoes
+
+    @staticmethod
+    def resultado_parcial(informacoes: Dict) -> bool:
+        """Extração cortada pelo orçamento de CPU (não vai para o DocumentStore)"""
+        return bool(informacoes.get('texto_incompleto') or informacoes.get('etapas_puladas'))
+
+    def processar_edital(
+            self,
+            url_pdf: str,
+            executor: Optional[Executor] = None,
+            timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        Processa PDF completo e retorna informações estruturadas
+
+        Args:
+            url_pdf: URL do PDF
+            executor: pool de processos para a extração (ver
+                criar_pool_extracao); o download continua na thread que chama
+            timeout: segundos de espera pela extração (padrão Config.PDF_TIMEOUT)
+        """
         print(f"Processando PDF: {url_pdf}")
 
-        pdf_bytes = self.baixar_pdf(url_pdf)
-        if not pdf_bytes:
+        hash_pdf = None
+        try:
+            with ExitStack() as arquivos:
+                # A vaga de download é liberada com o arquivo em disco, antes
+                # da extração
+                with self._downloads:
+                    caminho = arquivos.enter_context(self.baixar_pdf(url_pdf))
+
+                if not self.eh_pdf(caminho):
+                    print(f"  Não é um PDF: {url_pdf}")
+                    return dict(self.NAO_PDF)
+
+                texto = None
+                if self.store:
+                    hash_pdf = self.store.hash_da_url(url_pdf)
+
+                    informacoes = self.store.obter_resultado(hash_pdf, self.RESULTADO_EDITAL)
+                    if informacoes is not None:
+                        print(f"  Conteúdo já processado ({hash_pdf[:12]})")
+                        return {**informacoes, 'url_pdf': url_pdf}
+
+                    texto = (self.store.obter_resultado(hash_pdf, self.RESULTADO_TEXTO) or {}).get('texto')
+
+                if texto is not None:
+                    informacoes = self.analisar_texto(texto, url_pdf) if texto else {}
+                elif executor is not None:
+                    texto, informacoes = self._extrair_no_pool(executor, caminho, url_pdf, timeout)
+                else:
+                    texto, informacoes = self.extrair_arquivo(caminho, url_pdf)
+        except ConteudoInesperado:
+            print(f"  Não é um PDF: {url_pdf}")
+            return dict(self.NAO_PDF)
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            print(f"Erro ao baixar PDF {url_pdf}: {e}")
+            if status and 400 <= status < 500 and status not in self.STATUS_TRANSITORIOS:
+                return {'status_http': status}
+            return {}
+        except (TempoEsgotado, FuturesTimeout):
+            print(f"  Tempo esgotado na extração de {url_pdf}")
+            return {}
+        except Exception as e:
+            print(f"Erro ao baixar PDF {url_pdf}: {e}")
             return {}
 
-        texto = self.extrair_texto_pdf(pdf_bytes)
-        if not texto:
+        # Resultados cortados pelo orçamento não são guardados: numa próxima
+        # execução o documento é processado de novo
+        parcial = self.resultado_parcial(informacoes)
+
+        # Texto vazio também não: pode ser erro de extração ou falta de
+        # backend, e guardado impediria novas tentativas para este conteúdo
+        if hash_pdf and texto and texto.strip() and not informacoes.get('texto_incompleto'):
+            self.store.salvar_resultado(hash_pdf, self.RESULTADO_TEXTO, {'texto': texto})
+
+        if not informacoes:
             return {}
 
-        informacoes = {
-            'url_pdf': url_pdf,
-            'valores': self.extrair_valores(texto),
-            'datas': self.extrair_datas(texto),
-            'publico_alvo': self.extrair_publico_alvo(texto),
-            'requisitos': self.extrair_requisitos(texto),
-            'areas_tematicas': self.extrair_areas_tematicas(texto),
-            'tamanho_texto': len(texto),
-            'numero_paginas': texto.count('\n\n\n')  # Aproximação
-        }
+        informacoes['sha256'] = hash_pdf
+        if hash_pdf and not parcial:
+            self.store.salvar_resultado(hash_pdf, self.RESULTADO_EDITAL, informacoes)
 
         return informacoes
 
+    def _extrair_no_pool(
+            self,
+            executor: Executor,
+            caminho: str,
+            url_pdf: str,
+            timeout: Optional[float]
+    ) -> Tuple[str, Dict]:
+        timeout = timeout or self.config.PDF_TIMEOUT
+        future = executor.submit(extrair_em_processo, caminho, url_pdf)
+        try:
+            # O prazo só começa quando um processo pega o documento: a espera
+            # na fila (mais PDFs que Config.PDF_PROCESSOS) não é extração
+            while not future.running() and not wait([future], timeout=0.5).done:
+                pass
+
+            # Folga para o limite aplicado dentro do processo disparar antes
+            return future.result(timeout=timeout + 5)
+        except FuturesTimeout:
+            future.cancel()
+            raise
+        except BrokenProcessPool:
+            print("  Pool de extração indisponível, extraindo na thread atual")
+            return self.extrair_arquivo(caminho, url_pdf)
+
+
+# Pool de processos da extração: leitura do PDF e regexes são CPU puro e, em
+# threads, disputariam o GIL. Cada processo tem seu próprio extrator, sem
+# cliente HTTP nem DocumentStore (download e cache ficam no processo principal).
+_extrator_processo = None
+
+
+def _iniciar_processo_extracao(config: Config):
+    global _extrator_processo
+    _extrator_processo = EditalPDFExtractor(config, http_client=False, document_store=False)
+
+
+def extrair_em_processo(caminho: str, url_pdf: str) -> Tuple[str, Dict]:
+    """Executado no pool: extração com limite de Config.PDF_TIMEOUT segundos"""
+    with limite_tempo(_extrator_processo.config.PDF_TIMEOUT):
+        return _extrator_processo.extrair_arquivo(caminho, url_pdf)
+
+
+def criar_pool_extracao(config: Config, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Pool de processos para EditalPDFExtractor.processar_edital(executor=...)"""
+    return ProcessPoolExecutor(
+        max_workers=max_workers or config.PDF_PROCESSOS,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_iniciar_processo_extracao,
+        initargs=(config,)
+    )
+
 
 # Script integrado para uso completo
 def processar_editais_completo():
@@ -1,37 +1,81 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 import json
 from urllib.parse import urljoin
-import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from core.taxonomia import Taxonomia
+from utils.crawl_state import CrawlState
+from utils.html_parser import FILTRO_EDITAL, FILTRO_LISTA, parse_html
+from utils.http_client import HTTPClient, obter_cliente_http
+
+# Links da paginação do WordPress: .../categoria/editais/page/57/
+PADRAO_PAGINA = re.compile(r'/page/(\d+)/?')
+
+TAXONOMIA_TITULO = Taxonomia({
+    'entidade': {
+        'FAPEG': ['FAPEG'],
+        'FINEP': ['FINEP'],
+        'SEBRAE': ['SEBRAE'],
+        'SECTI': ['SECTI']
+    },
+    'area_foco': {
+        'Inovação': ['inovação', 'empreendimentos'],
+        'Pesquisa': ['pesquisa', 'científico'],
+        'Infraestrutura': ['laboratório', 'equipamento'],
+        'Mobilidade': ['mobilidade', 'internacional'],
+        'Energia': ['energia', 'energética']
+    },
+    # Ordem = prioridade (bolsa > financiamento > infraestrutura)
+    'tipo_apoio': {
+        'Bolsa': ['bolsa'],
+        'Financiamento': ['fomento', 'auxílio'],
+        'Infraestrutura': ['infraestrutura']
+    }
+})
 
 
 class FAPEGScraper:
     """Scraper básico para editais da FAPEG"""
 
-    def __init__(self, config):
+    def __init__(self, config, http_client: Optional[HTTPClient] = None):
         self.base_url = config.FAPEG_BASE_URL
         self.editais_url = config.FAPEG_EDITAIS_URL
         self.config = config
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Cliente HTTP compartilhado (pool, rate limit, GET condicional)
+        self.http = http_client or obter_cliente_http(config)
+
+        # Estado da coleta incremental (editais já vistos)
+        self.estado_coleta = CrawlState(config.CRAWL_STATE_FILE)
 
     def extrair_lista_editais(self, pagina: int = 1) -> List[Dict]:
         """Extrai lista de editais da página"""
+        return self._ler_pagina_lista(pagina)[0]
+
+    @staticmethod
+    def _total_paginas(soup) -> int:
+        """Maior número no widget de paginação (links a.page-numbers); 0 se não houver"""
+        total = 0
+        for link in soup.find_all('a', class_='page-numbers'):
+            match = PADRAO_PAGINA.search(link.get('href', ''))
+            if match:
+                total = max(total, int(match.group(1)))
+        return total
+
+    def _ler_pagina_lista(self, pagina: int) -> Tuple[List[Dict], int]:
+        """Editais da página de listagem e total de páginas informado pela paginação"""
         url = self.editais_url if pagina == 1 else f"{self.editais_url}page/{pagina}/"
 
         try:
-            response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT)
+            response = self.http.get(url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_html(response.content, FILTRO_LISTA, self.config.HTML_PARSER_RAPIDO)
         except Exception as e:
             print(f"Erro ao acessar {url}: {e}")
-            return []
+            return [], 0
 
         editais = []
         artigos = soup.find_all('article', class_='tease')
@@ -60,32 +104,58 @@ class FAPEGScraper:
                             data_atualizacao = date_link.get_text(strip=True).replace('Última Atualização em',
                                                                                       '').strip()
 
-                editais.append({
-                    'titulo': titulo,
-                    'url': url_edital,
-                    'data_publicacao': data_publicacao,
-                    'data_atualizacao': data_atualizacao,
-                    'numero_edital': self._extrair_numero_edital(titulo),
-                    'entidade_principal': self._identificar_entidade(titulo),
-                    'area_foco': self._identificar_area_foco(titulo),
-                    'tipo_apoio': self._identificar_tipo_apoio(titulo)
-                })
+                editais.append(
+                    self.montar_edital(titulo, url_edital, data_publicacao, data_atualizacao)
+                )
 
             except Exception as e:
                 print(f"Erro ao processar artigo: {e}")
                 continue
 
-        return editais
+        return editais, self._total_paginas(soup)
+
+    def montar_edital(
+            self,
+            titulo: str,
+            url: str,
+            data_publicacao: Optional[str],
+            data_atualizacao: Optional[str]
+    ) -> Dict:
+        """Registro básico do edital, com os campos derivados do título"""
+        classes = self._classificar_titulo(titulo)
+
+        return {
+            'titulo': titulo,
+            'url': url,
+            'data_publicacao': data_publicacao,
+            'data_atualizacao': data_atualizacao,
+            'numero_edital': self._extrair_numero_edital(titulo),
+            'entidade_principal': '/'.join(classes['entidade']) or 'FAPEG',
+            'area_foco': classes['area_foco'] or ['Geral'],
+            'tipo_apoio': classes['tipo_apoio'][0] if classes['tipo_apoio'] else 'Apoio Geral'
+        }
 
     def extrair_detalhes_edital(self, url: str) -> Dict:
         """Extrai detalhes de um edital específico"""
         try:
-            response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = self.http.get(url)
+            response.raise_for_status()
+            soup = parse_html(response.content, FILTRO_EDITAL, self.config.HTML_PARSER_RAPIDO)
         except Exception as e:
             print(f"Erro ao acessar {url}: {e}")
             return {}
 
+        return self.processar_conteudo_edital(url, soup.find('section', class_='entry-content'))
+
+    def processar_conteudo_edital(self, url: str, entry_content) -> Dict:
+        """
+        Extrai links (PDFs, resultados, anexos) e texto do conteúdo do edital
+
+        Args:
+            url: URL do edital
+            entry_content: elemento com o corpo do post (section.entry-content
+                da página ou o content.rendered da API REST)
+        """
         detalhes = {
             'url': url,
             'links_pdf': [],
@@ -94,8 +164,6 @@ class FAPEGScraper:
             'conteudo_texto': ''
         }
 
-        entry_content = soup.find('section', class_='entry-content')
-
         if entry_content:
             links = entry_content.find_all('a')
 
@@ -130,74 +198,149 @@ class FAPEGScraper:
         match = re.search(r'n[oº°]\s*(\d+/\d+)', titulo, re.IGNORECASE)
         return match.group(1) if match else None
 
-    def _identificar_entidade(self, titulo_ou_url: str) -> str:
-        texto = titulo_ou_url.upper()
-
-        entidades = {
-            'FAPEG': ['FAPEG'],
-            'FINEP': ['FINEP'],
-            'SEBRAE': ['SEBRAE'],
-            'SECTI': ['SECTI']
-        }
-
-        entidades_encontradas = []
-        for entidade, palavras in entidades.items():
-            if any(palavra in texto for palavra in palavras):
-                entidades_encontradas.append(entidade)
-
-        return '/'.join(entidades_encontradas) if entidades_encontradas else 'FAPEG'
-
-    def _identificar_area_foco(self, titulo: str) -> List[str]:
-        areas = {
-            'Inovação': ['inovação', 'empreendimentos'],
-            'Pesquisa': ['pesquisa', 'científico'],
-            'Infraestrutura': ['laboratório', 'equipamento'],
-            'Mobilidade': ['mobilidade', 'internacional'],
-            'Energia': ['energia', 'energética']
-        }
-
-        titulo_lower = titulo.lower()
-        areas_identificadas = []
-
-        for area, palavras in areas.items():
-            if any(palavra in titulo_lower for palavra in palavras):
-                areas_identificadas.append(area)
-
-        return areas_identificadas if areas_identificadas else ['Geral']
-
-    def _identificar_tipo_apoio(self, titulo: str) -> str:
-        titulo_lower = titulo.lower()
-
-        if 'bolsa' in titulo_lower:
-            return 'Bolsa'
-        elif 'fomento' in titulo_lower or 'auxílio' in titulo_lower:
-            return 'Financiamento'
-        elif 'infraestrutura' in titulo_lower:
-            return 'Infraestrutura'
-
-        return 'Apoio Geral'
+    def _classificar_titulo(self, titulo: str) -> Dict[str, List[str]]:
+        """Entidade, área de foco e tipo de apoio numa única passada pelo título"""
+        return TAXONOMIA_TITULO.classificar(titulo)
 
-    def coletar_todos_editais(self, max_paginas: int = 5) -> List[Dict]:
-        """Coleta editais de múltiplas páginas"""
-        todos_editais = []
-
-        for pagina in range(1, max_paginas + 1):
-            print(f"\nProcessando página {pagina}...")
-
-            editais_basicos = self.extrair_lista_editais(pagina)
-
-            if not editais_basicos:
-                break
+    def _coletar_detalhes(self, edital: Dict) -> Optional[Dict]:
+        """
+        Baixa a página de detalhes (o limite por host fica no HTTPClient)
 
+        Retorna None se a página não pôde ser lida: o edital não segue
+        adiante nem entra no estado da coleta, e a próxima execução
+        incremental tenta de novo.
+        """
+        try:
+            detalhes = self.extrair_detalhes_edital(edital['url'])
+            if not detalhes:
+                return None
+            edital.update(detalhes)
+            return edital
+        except Exception as e:
+            print(f"Erro: {e}")
+            return None
+
+    def descobrir_editais(
+            self,
+            max_paginas: Optional[int] = None,
+            max_workers: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Lista os editais de todas as páginas da listagem em paralelo
+
+        A página 1 informa o total de páginas (widget de paginação); as
+        demais são baixadas concorrentemente, sob o mesmo rate limit e
+        limite por host das páginas de detalhes. Editais que mudam de
+        página durante a coleta (por publicações novas) aparecem duas
+        vezes e são deduplicados pela URL, mantendo a primeira ocorrência.
+
+        Args:
+            max_paginas: limite de páginas (None = todas)
+            max_workers: threads (padrão Config.MAX_WORKERS)
+        """
+        max_workers = max_workers or self.config.MAX_WORKERS
+
+        editais, total = self._ler_pagina_lista(1)
+        if max_paginas:
+            total = min(total, max_paginas)
+        print(f"Listagem: {max(total, 1)} páginas")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for editais_pagina, _ in executor.map(self._ler_pagina_lista, range(2, total + 1)):
+                editais.extend(editais_pagina)
+
+        unicos = {}
+        for edital in editais:
+            unicos.setdefault(edital['url'], edital)
+
+        if len(unicos) < len(editais):
+            print(f"  {len(editais) - len(unicos)} editais repetidos entre páginas descartados")
+
+        return list(unicos.values())
+
+    def iter_editais(
+            self,
+            max_paginas: Optional[int] = 5,
+            max_workers: Optional[int] = None,
+            incremental: bool = False,
+            paralelo: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Gera os editais já enriquecidos, um a um, assim que cada página de
+        detalhes é processada
+
+        As páginas de detalhes de cada listagem são baixadas em paralelo
+        (max_workers threads, padrão Config.MAX_WORKERS), mantendo a ordem
+        da listagem.
+
+        Com incremental=True, só editais novos ou atualizados (segundo
+        self.estado_coleta) são detalhados, e a coleta para na primeira
+        página sem novidades. O estado não é gravado aqui: quem consome os
+        editais chama estado_coleta.registrar_todos()/salvar() depois de
+        processá-los.
+
+        Com paralelo=True, todas as páginas da listagem são descobertas de
+        uma vez (descobrir_editais) antes dos detalhes; max_paginas=None
+        percorre o histórico inteiro. No modo incremental não há parada
+        antecipada: só os editais já conhecidos são descartados.
+        """
+        max_workers = max_workers or self.config.MAX_WORKERS
+
+        if paralelo:
+            editais_basicos = self.descobrir_editais(max_paginas, max_workers)
+            if incremental:
+                editais_basicos = [
+                    e for e in editais_basicos
+                    if self.estado_coleta.eh_novo_ou_atualizado(e)
+                ]
             print(f"Encontrados {len(editais_basicos)} editais")
-
-            for edital in editais_basicos:
-                try:
-                    detalhes = self.extrair_detalhes_edital(edital['url'])
-                    edital.update(detalhes)
-                    todos_editais.append(edital)
-                    time.sleep(self.config.DELAY_BETWEEN_REQUESTS)
-                except Exception as e:
-                    print(f"Erro: {e}")
-
-        return todos_editais
\ No newline at end of file
+            yield from self.iter_detalhes(editais_basicos)
+            return
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for pagina in (range(1, max_paginas + 1) if max_paginas else count(1)):
+                print(f"\nProcessando página {pagina}...")
+
+                editais_basicos = self.extrair_lista_editais(pagina)
+
+                if not editais_basicos:
+                    break
+
+                print(f"Encontrados {len(editais_basicos)} editais")
+
+                if incremental:
+                    editais_basicos = [
+                        e for e in editais_basicos
+                        if self.estado_coleta.eh_novo_ou_atualizado(e)
+                    ]
+                    if not editais_basicos:
+                        print("Página sem editais novos ou atualizados, encerrando coleta")
+                        break
+                    print(f"  {len(editais_basicos)} novos ou atualizados")
+
+                yield from self.iter_detalhes(editais_basicos, executor)
+
+    def iter_detalhes(
+            self,
+            editais_basicos: List[Dict],
+            executor: Optional[ThreadPoolExecutor] = None
+    ) -> Iterator[Dict]:
+        """Detalha os editais em paralelo, na ordem recebida"""
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=self.config.MAX_WORKERS) as executor:
+                yield from self.iter_detalhes(editais_basicos, executor)
+            return
+
+        for edital in executor.map(self._coletar_detalhes, editais_basicos):
+            if edital is not None:
+                yield edital
+
+    def coletar_todos_editais(
+            self,
+            max_paginas: Optional[int] = 5,
+            max_workers: Optional[int] = None,
+            incremental: bool = False,
+            paralelo: bool = False
+    ) -> List[Dict]:
+        """Coleta editais de múltiplas páginas (ver iter_editais)"""
+        return list(self.iter_editais(max_paginas, max_workers, incremental, paralelo))
\ No newline at end of file
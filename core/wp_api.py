@@ -0,0 +1,155 @@
+import html
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from core.scraper import FAPEGScraper
+from utils.html_parser import parse_html
+
+MESES = [
+    'janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho',
+    'agosto', 'setembro', 'outubro', 'novembro', 'dezembro'
+]
+
+
+def formatar_data(data: datetime, com_de: bool = False) -> str:
+    """Data no formato exibido nas páginas ("2 outubro 2025" / "2 de outubro de 2025")"""
+    mes = MESES[data.month - 1]
+    if com_de:
+        return f"{data.day} de {mes} de {data.year}"
+    return f"{data.day} {mes} {data.year}"
+
+
+class APIIndisponivel(Exception):
+    """API REST do WordPress desativada, bloqueada ou com resposta inesperada"""
+
+
+class WordPressAPICollector:
+    """
+    Coleta editais pela API REST do WordPress (/wp-json/wp/v2)
+
+    Uma requisição traz até 100 posts da categoria de editais com título,
+    link, datas e conteúdo renderizado (projeção via _fields), em vez de
+    1 página de listagem + 1 página por edital. Se a API não responder,
+    recorre ao scraping HTML do FAPEGScraper.
+    """
+
+    CAMPOS = 'id,link,title,date,modified,content'
+    POSTS_POR_PAGINA = 100
+
+    def __init__(self, config, scraper: FAPEGScraper):
+        self.config = config
+        self.scraper = scraper
+        self.http = scraper.http
+        self.api_url = config.FAPEG_WP_API_URL.rstrip('/')
+        self._categoria_id = None
+
+    def _get_json(self, url: str, params: Dict):
+        # Query na própria URL: cache condicional e arquivo HTTP são indexados por ela
+        url = f"{url}?{urlencode(params)}"
+        try:
+            response = self.http.get(url)
+        except Exception as e:
+            raise APIIndisponivel(f"{url}: {e}")
+
+        if response.status_code != 200:
+            raise APIIndisponivel(f"{url}: HTTP {response.status_code}")
+
+        try:
+            return response.json(), response
+        except ValueError:
+            raise APIIndisponivel(f"{url}: resposta não é JSON")
+
+    def obter_categoria_id(self) -> int:
+        """ID da categoria de editais (pelo slug)"""
+        if self._categoria_id is None:
+            categorias, _ = self._get_json(
+                f"{self.api_url}/categories",
+                {'slug': self.config.FAPEG_CATEGORIA_SLUG, '_fields': 'id'}
+            )
+            if not categorias:
+                raise APIIndisponivel(f"Categoria '{self.config.FAPEG_CATEGORIA_SLUG}' não encontrada")
+            self._categoria_id = categorias[0]['id']
+
+        return self._categoria_id
+
+    def listar_posts(self, pagina: int) -> Tuple[List[Dict], int]:
+        """Uma página de posts da categoria (mais novos primeiro) e o total de páginas"""
+        posts, response = self._get_json(
+            f"{self.api_url}/posts",
+            {
+                'categories': self.obter_categoria_id(),
+                'per_page': self.POSTS_POR_PAGINA,
+                'page': pagina,
+                'orderby': 'date',
+                'order': 'desc',
+                '_fields': self.CAMPOS
+            }
+        )
+        total_paginas = int(response.headers.get('X-WP-TotalPages', pagina))
+        return posts, total_paginas
+
+    @staticmethod
+    def _formatar_data_iso(iso: Optional[str], com_de: bool) -> Optional[str]:
+        return formatar_data(datetime.fromisoformat(iso), com_de) if iso else None
+
+    def converter_post(self, post: Dict) -> Dict:
+        """Post da API -> edital no mesmo formato do FAPEGScraper"""
+        titulo = html.unescape(post['title']['rendered'])
+
+        edital = self.scraper.montar_edital(
+            titulo,
+            post['link'],
+            self._formatar_data_iso(post.get('date'), com_de=False),
+            self._formatar_data_iso(post.get('modified'), com_de=True)
+        )
+
+        conteudo = parse_html(post.get('content', {}).get('rendered', ''), None, self.config.HTML_PARSER_RAPIDO)
+        edital.update(self.scraper.processar_conteudo_edital(post['link'], conteudo))
+
+        return edital
+
+    def iter_editais(self, max_paginas: Optional[int] = None, incremental: bool = False) -> Iterator[Dict]:
+        """
+        Gera os editais da categoria, com detalhes, a partir da API
+
+        Args:
+            max_paginas: páginas de 100 posts (padrão Config.WP_API_MAX_PAGINAS)
+            incremental: mesmo critério do FAPEGScraper.iter_editais
+        """
+        max_paginas = max_paginas or self.config.WP_API_MAX_PAGINAS
+
+        try:
+            posts, total_paginas = self.listar_posts(1)
+        except APIIndisponivel as e:
+            print(f"API REST indisponível ({e}), usando scraping HTML")
+            yield from self.scraper.iter_editais(
+                max_paginas=self.config.MAX_PAGINAS,
+                incremental=incremental,
+                paralelo=self.config.LISTAGEM_PARALELA
+            )
+            return
+
+        pagina = 1
+        while True:
+            print(f"\nAPI REST: página {pagina}/{total_paginas} ({len(posts)} posts)")
+            editais = [self.converter_post(post) for post in posts]
+
+            if incremental:
+                editais = [e for e in editais if self.scraper.estado_coleta.eh_novo_ou_atualizado(e)]
+                if not editais:
+                    print("Página sem editais novos ou atualizados, encerrando coleta")
+                    return
+                print(f"  {len(editais)} novos ou atualizados")
+
+            yield from editais
+
+            pagina += 1
+            if pagina > min(total_paginas, max_paginas):
+                return
+
+            try:
+                posts, total_paginas = self.listar_posts(pagina)
+            except APIIndisponivel as e:
+                print(f"Erro na API REST: {e}")
+                return
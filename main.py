@@ -1,91 +1,312 @@
+import argparse
 import sys
+from collections import deque
 from config.config import Config
+from core.feed_monitor import FeedMonitor
+from core.fila_documentos import FilaDocumentos, documentos_com_falha
 from core.scraper import FAPEGScraper
-from core.pdf_extractor import EditalPDFExtractor
+from core.wp_api import WordPressAPICollector
+from core.pdf_extractor import EditalPDFExtractor, criar_pool_extracao
 from core.nlp_analyzer import EditalNLPAnalyzer
 from utils.cache import ResultCache
 from utils.structure_monitor import StructureMonitor
 import json
+import os
+
+
+class SaidaJSON:
+    """Grava a lista de editais no arquivo à medida que ficam prontos"""
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+        self.arquivo_tmp = f"{arquivo}.tmp"
+        self.urls = set()
+        self.total = 0
+        self._f = open(self.arquivo_tmp, 'w', encoding='utf-8')
+        self._f.write('[')
+
+    def escrever(self, edital: dict):
+        if self.total:
+            self._f.write(',')
+        self._f.write('\n')
+        self._f.write(json.dumps(edital, ensure_ascii=False, indent=2))
+        self.urls.add(edital.get('url'))
+        self.total += 1
+
+    def fechar(self, manter_anteriores: bool = False):
+        """Finaliza o arquivo; opcionalmente mantém editais antigos não reprocessados"""
+        if manter_anteriores and os.path.exists(self.arquivo):
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                anteriores = json.load(f)
+
+            for edital in anteriores:
+                if edital.get('url') not in self.urls:
+                    self.escrever(edital)
+
+        self._f.write('\n]')
+        self._f.close()
+        os.replace(self.arquivo_tmp, self.arquivo)
+
+    def descartar(self):
+        """Apaga o arquivo parcial; o arquivo de saída anterior fica intacto"""
+        self._f.close()
+        os.remove(self.arquivo_tmp)
+
+
+def processar_documento(url: str, pdf_extractor: EditalPDFExtractor, cache, pool=None) -> dict:
+    """Processa um documento do edital (com cache por URL)"""
+    if cache and cache.existe(url):
+        return cache.obter(url)
+
+    info_pdf = pdf_extractor.processar_edital(url, executor=pool)
+
+    # Falhas (resultado vazio) e extrações cortadas pelo orçamento não vão
+    # para o cache: a próxima execução tenta o documento de novo. URLs que
+    # não são PDF (EditalPDFExtractor.NAO_PDF) ou que responderam com um
+    # erro 4xx permanente vão, e não são baixadas de novo
+    if cache and info_pdf and not pdf_extractor.resultado_parcial(info_pdf):
+        cache.salvar(url, info_pdf)
+
+    return info_pdf
+
+
+def ler_argumentos() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Coleta de editais FAPEG - UniRV")
+    arquivo = parser.add_mutually_exclusive_group()
+    arquivo.add_argument(
+        '--gravar', metavar='ARQUIVO',
+        help="grava todas as respostas HTTP no arquivo (SQLite comprimido)"
+    )
+    arquivo.add_argument(
+        '--reproduzir', metavar='ARQUIVO',
+        help="executa offline, servindo as respostas do arquivo gravado"
+    )
+    parser.add_argument(
+        '--verificar-feed', action='store_true',
+        help="consulta só o feed RSS e processa apenas os editais novos ou alterados"
+    )
+    parser.add_argument(
+        '--historico', action='store_true',
+        help="percorre todas as páginas da listagem HTML em paralelo (carga histórica)"
+    )
+    return parser.parse_args()
 
 
 def main():
-    """Script principal de execução"""
+    """
+    Script principal de execução
+
+    Coleta, PDFs e NLP rodam em fluxo: cada edital segue para o
+    processamento de PDF assim que sua página de detalhes é lida, e é
+    gravado no arquivo de saída assim que fica pronto, na ordem da coleta.
+
+    Todos os documentos de cada edital (principal, resultados/retificações,
+    anexos) entram numa fila de prioridade única e são mesclados no edital
+    ao final. Os PDFs são baixados em threads (rede, rate limit
+    compartilhado) e a extração de texto e as regexes rodam num pool de
+    Config.PDF_PROCESSOS processos, com limite de Config.PDF_TIMEOUT
+    segundos por PDF.
+    """
+
+    args = ler_argumentos()
 
     print("=== Sistema de Coleta de Editais FAPEG - UniRV ===\n")
 
     # Inicializar componentes
     config = Config()
+
+    if args.gravar or args.reproduzir:
+        config.HTTP_ARCHIVE_MODE = 'gravar' if args.gravar else 'reproduzir'
+        config.HTTP_ARCHIVE_FILE = args.gravar or args.reproduzir
+        print(f"Arquivo HTTP: {config.HTTP_ARCHIVE_MODE} em {config.HTTP_ARCHIVE_FILE}")
+
+    if args.historico:
+        config.COLETA_VIA_API = False
+        config.LISTAGEM_PARALELA = True
+        config.MAX_PAGINAS = None
+
+    if args.reproduzir:
+        # Execução determinística: todo edital é reprocessado a cada vez, e
+        # texto e análises saem dos bytes arquivados, não dos caches locais
+        config.COLETA_INCREMENTAL = False
+        config.USE_CACHE = False
+        config.USE_DOCUMENT_STORE = False
+        config.USE_OCR_CACHE = False
+
     scraper = FAPEGScraper(config)
 
+    # Modo feed: uma requisição pequena decide se há algo a processar
+    feed = None
+    if args.verificar_feed:
+        feed = FeedMonitor(config, scraper)
+        editais_feed = feed.verificar()
+        if not editais_feed:
+            print("Nada a processar")
+            return
+
     # Cache
     cache = None
     if config.USE_CACHE:
         cache = ResultCache(config.CACHE_DIR, config.CACHE_TTL_HOURS)
         print(f"Cache ativado (TTL: {config.CACHE_TTL_HOURS}h)")
 
-    # 1. Coletar editais
-    print("\n[1/3] Coletando lista de editais...")
-    editais = scraper.coletar_todos_editais(max_paginas=3)
-    print(f"Total coletado: {len(editais)} editais")
+    # PDFs (se disponível)
+    pdf_extractor = EditalPDFExtractor(config) if config.USE_OCR else None
+
+    # Análise NLP (se disponível)
+    nlp = None
+    if config.USE_NLP:
+        try:
+            nlp = EditalNLPAnalyzer()
+        except Exception as e:
+            print(f"NLP não disponível: {e}")
+
+    arquivo_saida = 'editais_unirv_completo.json'
+    estatisticas = {'total': 0, 'com_pdf': 0, 'com_analise': 0, 'alta_relevancia': 0}
+    # Editais gravados sem falha: só eles são confirmados no estado do feed
+    urls_ok = set()
 
-    # 2. Processar PDFs (se disponível)
-    if config.USE_OCR:
-        print("\n[2/3] Processando PDFs com OCR...")
-        pdf_extractor = EditalPDFExtractor()
+    def finalizar(item):
+        """Grava o edital (dict ou future da fila de documentos)"""
+        if isinstance(item, dict):
+            edital = item
+        else:
+            try:
+                edital = item.result()
+            except Exception as e:
+                print(f"  Edital descartado: {e}")
+                return
 
-        for i, edital in enumerate(editais, 1):
-            if edital.get('links_pdf'):
-                print(f"  {i}/{len(editais)}: {edital['titulo'][:50]}...")
-                try:
-                    primeiro_pdf = edital['links_pdf'][0]['url']
+        saida.escrever(edital)
+        # Registros do feed não têm data_atualizacao: a marca sairia da data
+        # de publicação e a próxima coleta pela listagem/API veria todos como
+        # atualizados. Editais com documentos que falharam também ficam de
+        # fora (do estado da coleta e do feed), para a próxima execução
+        # processá-los de novo
+        falhas = documentos_com_falha(edital)
+        if falhas:
+            print(f"  {len(falhas)} documento(s) com falha, edital será reprocessado: {edital.get('url')}")
+        else:
+            urls_ok.add(edital.get('url'))
+            if config.COLETA_INCREMENTAL and not feed:
+                scraper.estado_coleta.registrar(edital)
 
-                    # Verificar cache
-                    if cache and cache.existe(primeiro_pdf):
-                        info_pdf = cache.obter(primeiro_pdf)
-                    else:
-                        info_pdf = pdf_extractor.processar_edital(primeiro_pdf)
-                        if cache:
-                            cache.salvar(primeiro_pdf, info_pdf)
+        estatisticas['total'] += 1
+        if edital.get('links_pdf'):
+            estatisticas['com_pdf'] += 1
+        if edital.get('detalhes_pdf'):
+            estatisticas['com_analise'] += 1
+        if edital.get('relevancia_unirv', {}).get('score_total', 0) >= 40:
+            estatisticas['alta_relevancia'] += 1
 
-                    edital['detalhes_pdf'] = info_pdf
-                except Exception as e:
-                    print(f"    Erro: {e}")
+    print("\nColetando editais e processando PDFs em fluxo...")
 
-    # 3. Análise NLP (se disponível)
-    if config.USE_NLP:
-        print("\n[3/3] Análise NLP...")
-        try:
-            nlp = EditalNLPAnalyzer()
+    if feed:
+        coletor = feed.iter_editais(editais_feed)
+    elif config.COLETA_VIA_API:
+        coletor = WordPressAPICollector(config, scraper).iter_editais(
+            incremental=config.COLETA_INCREMENTAL
+        )
+    else:
+        coletor = scraper.iter_editais(
+            max_paginas=config.MAX_PAGINAS,
+            incremental=config.COLETA_INCREMENTAL,
+            paralelo=config.LISTAGEM_PARALELA
+        )
 
-            for edital in editais:
-                if edital.get('conteudo_texto'):
-                    relevancia = nlp.classificar_relevancia_unirv(
+    # Fila de editais na ordem da coleta; cada um é gravado quando todos os
+    # seus documentos terminam
+    pendentes = deque()
+
+    # Cada thread da fila baixa e depois espera a extração no pool de
+    # processos. Downloads simultâneos ficam limitados a Config.PDF_WORKERS
+    # (e a Config.MAX_CONEXOES_POR_HOST por host, no HTTPClient); as demais
+    # threads, uma por processo, mantêm o pool ocupado durante os downloads
+    pool = criar_pool_extracao(config) if pdf_extractor else None
+    fila = FilaDocumentos(
+        lambda url: processar_documento(url, pdf_extractor, cache, pool),
+        config.PDF_WORKERS + config.PDF_PROCESSOS
+    ) if pdf_extractor else None
+
+    saida = SaidaJSON(arquivo_saida)
+    try:
+        for edital in coletor:
+            if nlp and edital.get('conteudo_texto'):
+                try:
+                    edital['relevancia_unirv'] = nlp.classificar_relevancia_unirv(
                         edital['conteudo_texto']
                     )
-                    edital['relevancia_unirv'] = relevancia
-        except Exception as e:
-            print(f"NLP não disponível: {e}")
+                except Exception as e:
+                    print(f"    Erro NLP: {e}")
 
-    # 4. Salvar resultados
-    arquivo_saida = 'editais_unirv_completo.json'
-    with open(arquivo_saida, 'w', encoding='utf-8') as f:
-        json.dump(editais, f, ensure_ascii=False, indent=2)
+            if fila:
+                pendentes.append(fila.enviar(edital))
+            else:
+                pendentes.append(edital)
 
+            # Grava o prefixo já concluído
+            while pendentes and (isinstance(pendentes[0], dict) or pendentes[0].done()):
+                finalizar(pendentes.popleft())
+
+        while pendentes:
+            finalizar(pendentes.popleft())
+    except BaseException:
+        # Coleta interrompida (erro ou Ctrl+C): sem o JSON pela metade e sem
+        # esperar os documentos que ainda estão na fila
+        saida.descartar()
+        if fila:
+            fila.fechar(cancelar=True)
+        raise
+    finally:
+        if fila:
+            fila.fechar()
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    saida.fechar(manter_anteriores=config.COLETA_INCREMENTAL or feed is not None)
     print(f"\n✓ Resultados salvos em: {arquivo_saida}")
 
-    # 5. Estatísticas
+    if feed:
+        feed.confirmar(urls_ok)
+
+    # Só marca como vistos os editais que chegaram ao arquivo de saída
+    if config.COLETA_INCREMENTAL:
+        scraper.estado_coleta.salvar()
+
+    # Estatísticas
     print("\n=== ESTATÍSTICAS ===")
-    print(f"Total de editais: {len(editais)}")
-    print(f"Com PDF: {sum(1 for e in editais if e.get('links_pdf'))}")
-    print(f"Com análise completa: {sum(1 for e in editais if e.get('detalhes_pdf'))}")
+    if config.COLETA_INCREMENTAL:
+        print(f"Editais no arquivo: {saida.total}")
+        print(f"Novos ou atualizados nesta execução: {estatisticas['total']}")
+    else:
+        print(f"Total de editais: {estatisticas['total']}")
+    print(f"Com PDF: {estatisticas['com_pdf']}")
+    print(f"Com análise completa: {estatisticas['com_analise']}")
 
-    if config.USE_NLP:
-        alta_relevancia = sum(
-            1 for e in editais
-            if e.get('relevancia_unirv', {}).get('score_total', 0) >= 40
-        )
-        print(f"Alta relevância para UniRV: {alta_relevancia}")
+    if nlp:
+        print(f"Alta relevância para UniRV: {estatisticas['alta_relevancia']}")
+
+    metricas = scraper.http.metricas.resumo()
+    print("\n=== HTTP ===")
+    print(f"Requisições: {metricas['requisicoes']} "
+          f"({metricas['reutilizadas_304']} reaproveitadas via 304, "
+          f"{metricas['retentativas']} retentativas)")
+    print(f"Transferido: {metricas['mb_transferidos']} MB, "
+          f"latência média {metricas['latencia_media_s']}s")
+
+    if pdf_extractor and pdf_extractor.store:
+        repositorio = pdf_extractor.store.estatisticas()
+        print("\n=== REPOSITÓRIO DE DOCUMENTOS ===")
+        print(f"{repositorio['documentos']} documentos distintos em {repositorio['urls']} URLs, "
+              f"{repositorio['resultados']} resultados guardados")
+
+    print("\n=== RATE LIMIT POR HOST ===")
+    for host, stats in scraper.http.rate_limiter.estatisticas().items():
+        print(f"{host}: {stats['taxa_atual']} req/s, "
+              f"{stats['requisicoes']} requisições, "
+              f"espera total {stats['espera_total_s']}s, "
+              f"{stats['throttles']} throttles")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,22 @@
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def mapear_arquivo(caminho: str) -> Iterator[mmap.mmap]:
+    """
+    Abre o arquivo como mmap somente leitura
+
+    O mmap tem read/seek/tell como um arquivo, então os leitores de PDF o
+    usam no lugar de io.BytesIO: as páginas são carregadas sob demanda
+    pelo sistema operacional, sem copiar o documento inteiro para a memória
+    do processo.
+    """
+    with open(caminho, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Arquivo vazio: {caminho}")
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            yield mapa
@@ -0,0 +1,61 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable
+
+
+class CrawlState:
+    """
+    Estado da coleta incremental
+
+    Guarda, por URL, a última data de atualização vista de cada edital.
+    Como a listagem da FAPEG é ordenada do mais novo para o mais antigo,
+    uma página inteira de editais conhecidos indica que o restante também
+    já foi processado.
+    """
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+        self.editais = {}
+        self._carregar()
+
+    def _carregar(self):
+        if not os.path.exists(self.arquivo):
+            return
+
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            self.editais = dados.get('editais', {})
+        except (OSError, ValueError) as e:
+            print(f"Estado da coleta ilegível ({e}), iniciando do zero")
+            self.editais = {}
+
+    @staticmethod
+    def _marca(edital: Dict) -> str:
+        return edital.get('data_atualizacao') or edital.get('data_publicacao') or ''
+
+    def eh_novo_ou_atualizado(self, edital: Dict) -> bool:
+        """True se o edital nunca foi visto ou mudou desde a última coleta"""
+        url = edital.get('url')
+        if url not in self.editais:
+            return True
+        return self.editais[url] != self._marca(edital)
+
+    def registrar(self, edital: Dict):
+        if edital.get('url'):
+            self.editais[edital['url']] = self._marca(edital)
+
+    def registrar_todos(self, editais: Iterable[Dict]):
+        for edital in editais:
+            self.registrar(edital)
+
+    def salvar(self):
+        dados = {
+            'timestamp': datetime.now().isoformat(),
+            'editais': self.editais
+        }
+
+        with open(f"{self.arquivo}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+        os.replace(f"{self.arquivo}.tmp", self.arquivo)
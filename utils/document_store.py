@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+
+def sha256_arquivo(caminho: str) -> str:
+    """SHA-256 do arquivo, lido em blocos"""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+class DocumentStore:
+    """
+    Repositório de documentos endereçado por conteúdo
+
+    A FAPEG republica o mesmo PDF em URLs diferentes (retificações, anexos
+    linkados por vários posts, reenvios). Aqui cada documento é guardado
+    uma vez, pelo SHA-256 dos bytes (diretorio/ab/abcdef....pdf), com um
+    índice URL -> hash. Texto extraído, OCR e dados estruturados ficam
+    associados ao hash, então qualquer URL que aponte para um conteúdo já
+    visto reaproveita os resultados sem reprocessar.
+    """
+
+    def __init__(self, diretorio: str):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(diretorio, 'indice.sqlite'), check_same_thread=False)
+        self._conn.executescript("""
+                                 CREATE TABLE IF NOT EXISTS urls (
+                                     url TEXT PRIMARY KEY,
+                                     hash TEXT NOT NULL,
+                                     visto_em TEXT NOT NULL
+                                 );
+                                 CREATE TABLE IF NOT EXISTS resultados (
+                                     hash TEXT NOT NULL,
+                                     tipo TEXT NOT NULL,
+                                     dados TEXT NOT NULL,
+                                     criado_em TEXT NOT NULL,
+                                     PRIMARY KEY (hash, tipo)
+                                 );
+                                 """)
+        self._conn.commit()
+
+    def caminho(self, hash_documento: str) -> str:
+        """Arquivo do documento no repositório"""
+        return os.path.join(self.diretorio, hash_documento[:2], f"{hash_documento}.pdf")
+
+    def armazenar(self, url: str, caminho: str) -> str:
+        """
+        Guarda o arquivo baixado (se o conteúdo ainda não existe) e
+        associa a URL ao hash
+
+        Returns:
+            SHA-256 do conteúdo
+        """
+        hash_documento = sha256_arquivo(caminho)
+        destino = self.caminho(hash_documento)
+
+        if not os.path.exists(destino):
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            shutil.copyfile(caminho, f"{destino}.{threading.get_ident()}.tmp")
+            os.replace(f"{destino}.{threading.get_ident()}.tmp", destino)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO urls VALUES (?, ?, ?)",
+                (url, hash_documento, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+        return hash_documento
+
+    def hash_da_url(self, url: str) -> Optional[str]:
+        """Hash do último conteúdo visto na URL"""
+        with self._lock:
+            linha = self._conn.execute("SELECT hash FROM urls WHERE url = ?", (url,)).fetchone()
+        return linha[0] if linha else None
+
+    def obter_resultado(self, hash_documento: str, tipo: str) -> Optional[Dict]:
+        """Resultado de um processamento ('texto', 'edital_pdf', ...) já feito para o conteúdo"""
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT dados FROM resultados WHERE hash = ? AND tipo = ?",
+                (hash_documento, tipo)
+            ).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def salvar_resultado(self, hash_documento: str, tipo: str, dados: Dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?)",
+                (hash_documento, tipo, json.dumps(dados, ensure_ascii=False), datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            urls, documentos = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT hash) FROM urls"
+            ).fetchone()
+            resultados = self._conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+
+        return {'urls': urls, 'documentos': documentos, 'resultados': resultados}
+
+
+_repositorio_compartilhado = None
+_lock_repositorio = threading.Lock()
+
+
+def obter_document_store(config) -> DocumentStore:
+    """Repositório único do processo"""
+    global _repositorio_compartilhado
+
+    with _lock_repositorio:
+        if _repositorio_compartilhado is None:
+            _repositorio_compartilhado = DocumentStore(config.DOCUMENT_STORE_DIR)
+        return _repositorio_compartilhado
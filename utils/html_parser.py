@@ -0,0 +1,59 @@
+from typing import List, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+
+    PARSER_RAPIDO = 'lxml'
+except ImportError:
+    PARSER_RAPIDO = 'html.parser'
+
+PARSER_PADRAO = 'html.parser'
+
+
+def filtro_por_classe(tags: Union[str, List[str]], *classes: str) -> SoupStrainer:
+    """
+    SoupStrainer para tags com qualquer uma das classes
+
+    Durante o parsing o atributo class ainda é a string bruta
+    ("tease post"), então class_='tease' não casaria; a comparação é
+    feita por palavra.
+    """
+    def tem_classe(valor) -> bool:
+        if not valor:
+            return False
+        valores = valor.split() if isinstance(valor, str) else valor
+        return any(classe in valores for classe in classes)
+
+    return SoupStrainer(tags, class_=tem_classe)
+
+
+# Subárvores usadas pelo scraper: o resto da página WordPress (menus,
+# rodapé, scripts) nem chega a virar árvore. Na listagem entram também os
+# links da paginação (a.page-numbers), que dão o total de páginas
+FILTRO_LISTA = filtro_por_classe(['article', 'a'], 'tease', 'page-numbers')
+FILTRO_EDITAL = filtro_por_classe('section', 'entry-content')
+
+
+def parse_html(
+        conteudo: Union[bytes, str],
+        filtro: Optional[SoupStrainer] = None,
+        rapido: bool = True
+) -> BeautifulSoup:
+    """
+    Monta o BeautifulSoup da página
+
+    Args:
+        conteudo: HTML bruto
+        filtro: SoupStrainer com a subárvore de interesse (None = página inteira)
+        rapido: usar lxml + filtro; se False ou se falhar, volta ao
+            html.parser com a página inteira (comportamento original)
+    """
+    if rapido:
+        try:
+            return BeautifulSoup(conteudo, PARSER_RAPIDO, parse_only=filtro)
+        except Exception as e:
+            print(f"Parser rápido falhou ({e}), usando {PARSER_PADRAO}")
+
+    return BeautifulSoup(conteudo, PARSER_PADRAO)
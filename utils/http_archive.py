@@ -0,0 +1,135 @@
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, List
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+MODO_GRAVAR = 'gravar'
+MODO_REPRODUZIR = 'reproduzir'
+
+# O corpo é gravado já decodificado; estes cabeçalhos deixariam de valer
+CABECALHOS_DESCARTADOS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class RespostaNaoArquivada(requests.ConnectionError):
+    """URL pedida em modo reprodução que não está no arquivo"""
+
+
+class HTTPArchive:
+    """
+    Arquivo local de respostas HTTP para execuções offline
+
+    Em modo 'gravar', cada resposta (status, cabeçalhos e corpo bruto -
+    HTML ou bytes do PDF) é guardada comprimida com zlib num SQLite,
+    indexada pela URL. Em modo 'reproduzir', o cliente HTTP responde só a
+    partir do arquivo, sem tocar na rede, o que torna o pipeline
+    determinístico para profiling e benchmarks.
+    """
+
+    def __init__(self, caminho: str, modo: str):
+        if modo not in (MODO_GRAVAR, MODO_REPRODUZIR):
+            raise ValueError(f"Modo de arquivo HTTP inválido: {modo}")
+
+        self.caminho = caminho
+        self.modo = modo
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False)
+        self._conn.execute("""
+                           CREATE TABLE IF NOT EXISTS respostas (
+                               url TEXT PRIMARY KEY,
+                               status INTEGER NOT NULL,
+                               headers TEXT NOT NULL,
+                               corpo BLOB NOT NULL,
+                               tamanho INTEGER NOT NULL,
+                               gravado_em TEXT NOT NULL
+                           )
+                           """)
+        self._conn.commit()
+
+    @property
+    def reproduzindo(self) -> bool:
+        return self.modo == MODO_REPRODUZIR
+
+    def gravar(self, url: str, response: requests.Response):
+        """Guarda a resposta final (após retentativas) para a URL"""
+        self._inserir(url, response, zlib.compress(response.content, 6), len(response.content))
+
+    def gravar_arquivo(self, url: str, response: requests.Response, caminho: str):
+        """
+        Guarda uma resposta cujo corpo foi baixado em disco (stream)
+
+        O corpo é lido e comprimido em blocos, sem ficar inteiro na memória;
+        só a versão comprimida é montada para o INSERT.
+        """
+        compressor = zlib.compressobj(6)
+        partes = []
+        tamanho = 0
+        with open(caminho, 'rb') as f:
+            for bloco in iter(lambda: f.read(1024 * 1024), b''):
+                tamanho += len(bloco)
+                partes.append(compressor.compress(bloco))
+        partes.append(compressor.flush())
+
+        self._inserir(url, response, b''.join(partes), tamanho)
+
+    def _inserir(self, url: str, response: requests.Response, comprimido: bytes, tamanho: int):
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() not in CABECALHOS_DESCARTADOS
+        }
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.status_code,
+                    json.dumps(headers),
+                    comprimido,
+                    tamanho,
+                    datetime.now().isoformat()
+                )
+            )
+            self._conn.commit()
+
+    def reproduzir(self, url: str) -> requests.Response:
+        """Monta a resposta gravada para a URL"""
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT status, headers, corpo FROM respostas WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        if linha is None:
+            raise RespostaNaoArquivada(f"URL não está no arquivo {self.caminho}: {url}")
+
+        status, headers, corpo = linha
+
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = zlib.decompress(corpo)
+        response.reutilizada = False
+
+        return response
+
+    def listar(self) -> List[Dict]:
+        """URLs arquivadas com status e tamanho original"""
+        with self._lock:
+            linhas = self._conn.execute(
+                "SELECT url, status, tamanho, length(corpo) FROM respostas ORDER BY url"
+            ).fetchall()
+
+        return [
+            {'url': url, 'status': status, 'bytes': tamanho, 'bytes_comprimidos': comprimido}
+            for url, status, tamanho, comprimido in linhas
+        ]
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class ConditionalGetCache:
+    """
+    Cache de GET condicional (ETag / Last-Modified)
+
+    Guarda os validadores e o corpo da última resposta de cada URL. Nas
+    requisições seguintes envia If-None-Match / If-Modified-Since e, se o
+    servidor responder 304, devolve o corpo salvo em vez de baixá-lo de novo.
+
+    Downloads guardados no DocumentStore ficam só com os validadores
+    (salvar_validadores): o corpo é o do repositório, sem uma segunda cópia.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _gerar_chave(self, url: str) -> str:
+        return hashlib.md5(url.encode()).hexdigest()
+
+    def _arquivo_meta(self, chave: str) -> str:
+        return os.path.join(self.cache_dir, f"{chave}.json")
+
+    def _arquivo_corpo(self, chave: str) -> str:
+        return os.path.join(self.cache_dir, f"{chave}.body")
+
+    @staticmethod
+    def _temporario(destino: str) -> str:
+        # Um temporário por thread: downloads simultâneos da mesma URL não
+        # escrevem no mesmo arquivo antes do os.replace
+        return f"{destino}.{threading.get_ident()}.tmp"
+
+    def _carregar_meta(self, url: str) -> Optional[Dict]:
+        chave = self._gerar_chave(url)
+        arquivo = self._arquivo_meta(chave)
+
+        if not os.path.exists(arquivo):
+            return None
+
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not meta.get('corpo_externo') and not os.path.exists(self._arquivo_corpo(chave)):
+            return None
+        return meta
+
+    def cabecalhos_condicionais(self, url: str) -> Dict[str, str]:
+        """Retorna os cabeçalhos If-None-Match / If-Modified-Since para a URL"""
+        meta = self._carregar_meta(url)
+        if not meta:
+            return {}
+
+        cabecalhos = {}
+        if meta.get('etag'):
+            cabecalhos['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = meta['last_modified']
+
+        return cabecalhos
+
+    @staticmethod
+    def _tem_validadores(headers) -> bool:
+        # Sem validadores não há como fazer GET condicional depois
+        return bool(headers.get('ETag') or headers.get('Last-Modified'))
+
+    def salvar(self, url: str, response: requests.Response):
+        """Salva validadores e corpo de uma resposta 200"""
+        if not self._tem_validadores(response.headers):
+            return
+
+        # Escrita atômica: as threads do scraper podem salvar ao mesmo tempo
+        corpo = self._arquivo_corpo(self._gerar_chave(url))
+        temporario = self._temporario(corpo)
+        with open(temporario, 'wb') as f:
+            f.write(response.content)
+        os.replace(temporario, corpo)
+
+        self._salvar_meta(url, response.headers)
+
+    def salvar_arquivo(self, url: str, headers, caminho: str):
+        """Salva validadores e corpo de uma resposta 200 já gravada em disco"""
+        if not self._tem_validadores(headers):
+            return
+
+        corpo = self._arquivo_corpo(self._gerar_chave(url))
+        temporario = self._temporario(corpo)
+        shutil.copyfile(caminho, temporario)
+        os.replace(temporario, corpo)
+
+        self._salvar_meta(url, headers)
+
+    def salvar_validadores(self, url: str, headers):
+        """Salva só os validadores de uma resposta 200 cujo corpo fica em outro lugar"""
+        if not self._tem_validadores(headers):
+            return
+
+        self._salvar_meta(url, headers, corpo_externo=True)
+
+        # Cópia de uma execução anterior (sem repositório) não é mais usada
+        try:
+            os.remove(self._arquivo_corpo(self._gerar_chave(url)))
+        except FileNotFoundError:
+            pass
+
+    def arquivo_corpo_salvo(self, url: str) -> Optional[str]:
+        """Caminho do corpo salvo da URL (para respostas 304 de downloads em disco)"""
+        meta = self._carregar_meta(url)
+        if not meta or meta.get('corpo_externo'):
+            return None
+        return self._arquivo_corpo(self._gerar_chave(url))
+
+    def _salvar_meta(self, url: str, headers, corpo_externo: bool = False):
+        chave = self._gerar_chave(url)
+        meta = {
+            'url': url,
+            'timestamp': datetime.now().isoformat(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'headers': dict(headers),
+            'corpo_externo': corpo_externo
+        }
+
+        arquivo = self._arquivo_meta(chave)
+        temporario = self._temporario(arquivo)
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, arquivo)
+
+    def resposta_salva(self, url: str) -> Optional[requests.Response]:
+        """Resposta 200 com os cabeçalhos salvos, sem ler o corpo (ver arquivo_corpo_salvo)"""
+        meta = self._carregar_meta(url)
+        if not meta:
+            return None
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.reutilizada = True
+
+        return response
+
+    def reutilizar(self, url: str) -> Optional[requests.Response]:
+        """Monta uma resposta 200 a partir do corpo salvo"""
+        response = self.resposta_salva(url)
+        if response is None:
+            return None
+
+        try:
+            with open(self._arquivo_corpo(self._gerar_chave(url)), 'rb') as f:
+                response._content = f.read()
+        except OSError:
+            return None
+
+        return response
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """GET condicional: 304 reaproveita o corpo salvo"""
+        headers = dict(kwargs.pop('headers', None) or {})
+        condicionais = self.cabecalhos_condicionais(url)
+
+        response = session.get(url, headers={**headers, **condicionais}, **kwargs)
+
+        if response.status_code == 304:
+            reutilizada = self.reutilizar(url)
+            if reutilizada is not None:
+                return reutilizada
+
+            # Corpo salvo sumiu: refazer a requisição sem validadores
+            response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 200:
+            self.salvar(url, response)
+
+        response.reutilizada = False
+        return response
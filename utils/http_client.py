@@ -0,0 +1,382 @@
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+from utils.document_store import DocumentStore
+from utils.http_archive import HTTPArchive
+from utils.http_cache import ConditionalGetCache
+from utils.rate_limiter import RateLimitedAdapter, obter_rate_limiter
+
+
+class ArquivoMuitoGrande(Exception):
+    """Download acima de Config.DOWNLOAD_MAX_MB"""
+
+
+class ConteudoInesperado(Exception):
+    """Download sem a assinatura esperada (ex.: página HTML no lugar de um PDF)"""
+
+
+class MetricasHTTP:
+    """Métricas agregadas das requisições (bytes, latência, status)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requisicoes = 0
+        self.bytes = 0
+        self.latencia_total = 0.0
+        self.latencia_maxima = 0.0
+        self.reutilizadas = 0
+        self.retentativas = 0
+        self.falhas = 0
+        self.por_status = {}
+
+    def registrar(self, status: Optional[int], num_bytes: int, latencia: float, reutilizada: bool = False):
+        with self._lock:
+            self.requisicoes += 1
+            self.bytes += num_bytes
+            self.latencia_total += latencia
+            self.latencia_maxima = max(self.latencia_maxima, latencia)
+            if reutilizada:
+                self.reutilizadas += 1
+            if status is None:
+                self.falhas += 1
+            else:
+                self.por_status[status] = self.por_status.get(status, 0) + 1
+
+    def registrar_bytes(self, num_bytes: int, reutilizada: bool = False):
+        """Bytes de um corpo lido em stream, após a requisição (reutilizada: 304 com corpo salvo)"""
+        with self._lock:
+            self.bytes += num_bytes
+            if reutilizada:
+                self.reutilizadas += 1
+
+    def registrar_retentativa(self):
+        with self._lock:
+            self.retentativas += 1
+
+    def resumo(self) -> Dict:
+        with self._lock:
+            return {
+                'requisicoes': self.requisicoes,
+                'mb_transferidos': round(self.bytes / (1024 * 1024), 2),
+                'latencia_media_s': round(self.latencia_total / self.requisicoes, 3)
+                if self.requisicoes else 0.0,
+                'latencia_maxima_s': round(self.latencia_maxima, 3),
+                'reutilizadas_304': self.reutilizadas,
+                'retentativas': self.retentativas,
+                'falhas': self.falhas,
+                'por_status': dict(self.por_status)
+            }
+
+
+class HTTPClient:
+    """
+    Cliente HTTP único do projeto
+
+    Uma só sessão (pool de conexões keep-alive) usada pelo scraper, pelo
+    extrator de PDF e pelo scraper avançado. Toda requisição passa pelo
+    rate limiter por host e pelo GET condicional, com retentativa por
+    backoff exponencial com jitter e métricas por requisição. No máximo
+    Config.MAX_CONEXOES_POR_HOST requisições ficam em andamento por host,
+    somando todos os componentes (downloads em disco contam até o corpo
+    ser gravado).
+
+    Com Config.HTTP_ARCHIVE_MODE = 'gravar' as respostas são guardadas em
+    Config.HTTP_ARCHIVE_FILE; com 'reproduzir' são servidas só de lá,
+    sem rede.
+    """
+
+    STATUS_RETENTATIVA = (429, 500, 502, 503, 504)
+
+    def __init__(self, config):
+        self.config = config
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # Inclui br/zstd quando brotli/zstandard estão instalados
+            'Accept-Encoding': DEFAULT_ACCEPT_ENCODING
+        })
+
+        # Retentativas ficam por conta do cliente para que cada tentativa
+        # passe pelo rate limiter
+        self.rate_limiter = obter_rate_limiter(config)
+        adapter = RateLimitedAdapter(
+            self.rate_limiter,
+            pool_connections=config.HTTP_POOL_CONEXOES,
+            pool_maxsize=config.HTTP_POOL_MAXSIZE,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.http_cache = ConditionalGetCache(
+            config.HTTP_CACHE_DIR
+        ) if config.USE_CONDITIONAL_GET else None
+
+        self.arquivo = HTTPArchive(
+            config.HTTP_ARCHIVE_FILE,
+            config.HTTP_ARCHIVE_MODE
+        ) if config.HTTP_ARCHIVE_MODE else None
+
+        self.metricas = MetricasHTTP()
+
+        self._semaforos_host = {}
+        self._lock_semaforos = threading.Lock()
+
+    def _conexao_host(self, url: str) -> threading.BoundedSemaphore:
+        """Vaga entre as Config.MAX_CONEXOES_POR_HOST requisições simultâneas do host"""
+        host = urlparse(url).netloc
+        with self._lock_semaforos:
+            if host not in self._semaforos_host:
+                self._semaforos_host[host] = threading.BoundedSemaphore(
+                    self.config.MAX_CONEXOES_POR_HOST
+                )
+            return self._semaforos_host[host]
+
+    def _backoff(self, tentativa: int) -> float:
+        return self.config.RETRY_BACKOFF * (2 ** tentativa) + random.uniform(0, self.config.RETRY_JITTER)
+
+    def _requisitar(self, url: str, condicional: bool, **kwargs) -> requests.Response:
+        inicio = time.monotonic()
+        try:
+            if condicional and self.http_cache:
+                response = self.http_cache.get(self.session, url, **kwargs)
+            else:
+                response = self.session.get(url, **kwargs)
+                response.reutilizada = False
+        except requests.RequestException:
+            self.metricas.registrar(None, 0, time.monotonic() - inicio)
+            raise
+
+        num_bytes = 0 if response.reutilizada or kwargs.get('stream') else len(response.content)
+        # Resposta montada do corpo salvo: conta com o status que veio da
+        # rede (304), como os downloads em disco de baixar_arquivo
+        self.metricas.registrar(
+            304 if response.reutilizada else response.status_code,
+            num_bytes,
+            time.monotonic() - inicio,
+            response.reutilizada
+        )
+        return response
+
+    def get(self, url: str, condicional: bool = True, **kwargs) -> requests.Response:
+        """
+        GET com retentativas (Config.MAX_RETRIES) e timeouts do Config
+
+        Args:
+            url: URL a buscar
+            condicional: usar ETag / Last-Modified quando disponíveis
+        """
+        if self.arquivo and self.arquivo.reproduzindo:
+            inicio = time.monotonic()
+            response = self.arquivo.reproduzir(url)
+            self.metricas.registrar(response.status_code, len(response.content), time.monotonic() - inicio)
+            return response
+
+        response = self._get_com_retentativas(url, condicional, **kwargs)
+
+        if self.arquivo:
+            self.arquivo.gravar(url, response)
+
+        return response
+
+    @contextmanager
+    def baixar_arquivo(
+            self,
+            url: str,
+            max_bytes: Optional[int] = None,
+            assinatura: Optional[bytes] = None,
+            repositorio: Optional[DocumentStore] = None
+    ) -> Iterator[str]:
+        """
+        Baixa a URL em blocos para um arquivo em disco e fornece o caminho
+
+        O corpo nunca fica inteiro na memória: é gravado em blocos de
+        Config.DOWNLOAD_CHUNK_BYTES num arquivo temporário (Config.DOWNLOAD_DIR),
+        apagado ao sair do bloco with. Downloads acima de max_bytes (padrão
+        Config.DOWNLOAD_MAX_MB) são recusados já pelo Content-Length ou
+        interrompidos ao ultrapassar o limite. Num 304 o caminho é o do
+        corpo guardado pelo GET condicional.
+
+        Com assinatura (ex.: b'%PDF'), o download é interrompido com
+        ConteudoInesperado se ela não estiver no primeiro KB do corpo, sem
+        ler o restante.
+
+        Com repositorio, o download é guardado nele (DocumentStore.armazenar,
+        consulte o hash com hash_da_url) e o GET condicional guarda só os
+        validadores: num 304 o caminho é o do documento no repositório.
+
+            with http.baixar_arquivo(url) as caminho:
+                ...
+        """
+        max_bytes = max_bytes or self.config.DOWNLOAD_MAX_MB * 1024 * 1024
+
+        if self.arquivo and self.arquivo.reproduzindo:
+            response = self.get(url)
+            response.raise_for_status()
+            if len(response.content) > max_bytes:
+                raise ArquivoMuitoGrande(f"{url}: {len(response.content)} bytes")
+            caminho = self._gravar_temporario(url, [response.content], max_bytes, assinatura)
+            temporario = True
+            if repositorio:
+                repositorio.armazenar(url, caminho)
+        else:
+            # A conexão fica ocupada até o corpo estar em disco
+            with self._conexao_host(url):
+                caminho, temporario = self._baixar_da_rede(url, max_bytes, assinatura, repositorio)
+
+        if not temporario:
+            yield caminho
+            return
+
+        try:
+            yield caminho
+        finally:
+            os.remove(caminho)
+
+    def _baixar_da_rede(
+            self,
+            url: str,
+            max_bytes: int,
+            assinatura: Optional[bytes],
+            repositorio: Optional[DocumentStore]
+    ) -> Tuple[str, bool]:
+        """Caminho do corpo em disco e se é um temporário (False: corpo salvo de um 304)"""
+        if repositorio:
+            # Validadores só valem se o documento ainda está no repositório
+            hash_documento = repositorio.hash_da_url(url)
+            corpo = repositorio.caminho(hash_documento) if hash_documento else None
+            if corpo and not os.path.exists(corpo):
+                corpo = None
+        else:
+            corpo = self.http_cache.arquivo_corpo_salvo(url) if self.http_cache else None
+
+        headers = self.http_cache.cabecalhos_condicionais(url) if self.http_cache and corpo else {}
+        response = self._get_com_retentativas(url, False, stream=True, headers=headers)
+
+        if response.status_code == 304:
+            response.close()
+            salva = self.http_cache.resposta_salva(url) if corpo and self.arquivo else None
+            if corpo and (not self.arquivo or salva):
+                tamanho = os.path.getsize(corpo)
+                if tamanho > max_bytes:
+                    raise ArquivoMuitoGrande(f"{url}: {tamanho} bytes")
+
+                # Nada transferido além dos cabeçalhos: conta como reutilizada
+                self.metricas.registrar_bytes(0, reutilizada=True)
+                if self.arquivo:
+                    # Gravando: o arquivo guarda o 200 com o corpo salvo,
+                    # senão --reproduzir não teria esta URL
+                    self.arquivo.gravar_arquivo(url, salva, corpo)
+                return corpo, False
+
+            # Corpo salvo sumiu: refazer a requisição sem validadores
+            response = self._get_com_retentativas(url, False, stream=True)
+
+        try:
+            response.raise_for_status()
+
+            tamanho = int(response.headers.get('Content-Length') or 0)
+            if tamanho > max_bytes:
+                raise ArquivoMuitoGrande(f"{url}: Content-Length {tamanho} bytes")
+
+            caminho = self._gravar_temporario(
+                url,
+                response.iter_content(self.config.DOWNLOAD_CHUNK_BYTES),
+                max_bytes,
+                assinatura
+            )
+        finally:
+            response.close()
+
+        self.metricas.registrar_bytes(os.path.getsize(caminho))
+        if repositorio:
+            repositorio.armazenar(url, caminho)
+            if self.http_cache:
+                self.http_cache.salvar_validadores(url, response.headers)
+        elif self.http_cache:
+            self.http_cache.salvar_arquivo(url, response.headers, caminho)
+        if self.arquivo:
+            self.arquivo.gravar_arquivo(url, response, caminho)
+
+        return caminho, True
+
+    def _gravar_temporario(self, url: str, blocos, max_bytes: int, assinatura: Optional[bytes] = None) -> str:
+        sufixo = os.path.splitext(url.split('?')[0])[1][:8]
+        if self.config.DOWNLOAD_DIR:
+            os.makedirs(self.config.DOWNLOAD_DIR, exist_ok=True)
+        fd, caminho = tempfile.mkstemp(suffix=sufixo, dir=self.config.DOWNLOAD_DIR)
+
+        total = 0
+        inicio = b''
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for bloco in blocos:
+                    total += len(bloco)
+                    if total > max_bytes:
+                        raise ArquivoMuitoGrande(f"{url}: mais de {max_bytes} bytes")
+                    if assinatura and inicio is not None:
+                        inicio += bloco[:1024]
+                        if len(inicio) >= 1024:
+                            self._verificar_assinatura(url, inicio, assinatura)
+                            inicio = None
+                    f.write(bloco)
+                if assinatura and inicio is not None:
+                    self._verificar_assinatura(url, inicio, assinatura)
+        except BaseException:
+            os.remove(caminho)
+            raise
+
+        return caminho
+
+    @staticmethod
+    def _verificar_assinatura(url: str, inicio: bytes, assinatura: bytes):
+        if assinatura not in inicio[:1024]:
+            raise ConteudoInesperado(f"{url}: sem a assinatura {assinatura!r}")
+
+    def _get_com_retentativas(self, url: str, condicional: bool, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', (self.config.CONNECT_TIMEOUT, self.config.REQUEST_TIMEOUT))
+
+        for tentativa in range(self.config.MAX_RETRIES + 1):
+            ultima = tentativa == self.config.MAX_RETRIES
+
+            try:
+                if kwargs.get('stream'):
+                    # Quem pede stream segura a vaga do host até ler o corpo
+                    response = self._requisitar(url, condicional, **kwargs)
+                else:
+                    with self._conexao_host(url):
+                        response = self._requisitar(url, condicional, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if ultima:
+                    raise
+            else:
+                if response.status_code not in self.STATUS_RETENTATIVA or ultima:
+                    return response
+                response.close()
+
+            self.metricas.registrar_retentativa()
+            time.sleep(self._backoff(tentativa))
+
+
+_cliente_compartilhado = None
+_lock_cliente = threading.Lock()
+
+
+def obter_cliente_http(config) -> HTTPClient:
+    """Cliente HTTP único do processo (uma conexão/TLS por host por execução)"""
+    global _cliente_compartilhado
+
+    with _lock_cliente:
+        if _cliente_compartilhado is None:
+            _cliente_compartilhado = HTTPClient(config)
+        return _cliente_compartilhado
@@ -0,0 +1,76 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+
+class OCRCache:
+    """
+    Cache de OCR por página
+
+    A chave é a impressão digital da página rasterizada (SHA-256 da imagem
+    gerada pelo pdftoppm) junto com os parâmetros que mudam o resultado
+    (idioma, opções do tesseract, DPI). Uma retificação que troca uma
+    página de um edital digitalizado só manda essa página para o OCR; as
+    outras, idênticas pixel a pixel, saem daqui, venham da URL que vierem.
+    """
+
+    def __init__(self, arquivo: str):
+        self.arquivo = arquivo
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(arquivo, check_same_thread=False)
+        self._conn.executescript("""
+                                 CREATE TABLE IF NOT EXISTS paginas (
+                                     chave TEXT PRIMARY KEY,
+                                     texto TEXT NOT NULL,
+                                     confianca REAL,
+                                     criado_em TEXT NOT NULL
+                                 );
+                                 """)
+        self._conn.commit()
+
+    @staticmethod
+    def chave(impressao: str, lang: str, opcoes: str, dpi: int) -> str:
+        """Chave de uma página: impressão digital da imagem + parâmetros do OCR"""
+        return hashlib.sha256(f"{impressao}|{lang}|{opcoes}|{dpi}".encode()).hexdigest()
+
+    def obter(self, chave: str) -> Optional[Tuple[str, Optional[float]]]:
+        """(texto, confiança média) da página, se já lida"""
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT texto, confianca FROM paginas WHERE chave = ?", (chave,)
+            ).fetchone()
+        return (linha[0], linha[1]) if linha else None
+
+    def salvar(self, chave: str, texto: str, confianca: Optional[float] = None):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO paginas (chave, texto, confianca, criado_em) VALUES (?, ?, ?, ?)",
+                (chave, texto, confianca, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            paginas = self._conn.execute("SELECT COUNT(*) FROM paginas").fetchone()[0]
+        return {'paginas': paginas}
+
+    def fechar(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache_compartilhado = None
+_lock_cache = threading.Lock()
+
+
+def obter_cache_ocr(config) -> OCRCache:
+    """Cache de OCR único do processo"""
+    global _cache_compartilhado
+
+    with _lock_cache:
+        if _cache_compartilhado is None:
+            _cache_compartilhado = OCRCache(config.OCR_CACHE_FILE)
+        return _cache_compartilhado
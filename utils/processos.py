@@ -0,0 +1,58 @@
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class TempoEsgotado(Exception):
+    """Tarefa passou do limite de tempo"""
+
+
+@contextmanager
+def limite_tempo(segundos: Optional[float]) -> Iterator[None]:
+    """
+    Interrompe o bloco com TempoEsgotado após `segundos` (relógio de parede)
+
+    Usa SIGALRM, então só vale na thread principal de sistemas POSIX -
+    como nos processos do pool de extração. Onde não há SIGALRM (Windows)
+    o bloco roda sem limite e o chamador deve aplicar o timeout na espera
+    do future.
+    """
+    if (not segundos or not hasattr(signal, 'SIGALRM')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def estourou(signum, frame):
+        raise TempoEsgotado(f"limite de {segundos}s excedido")
+
+    anterior = signal.signal(signal.SIGALRM, estourou)
+    signal.setitimer(signal.ITIMER_REAL, segundos)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, anterior)
+
+
+class OrcamentoCPU:
+    """
+    Tempo de CPU reservado a um documento
+
+    Conta o tempo de CPU da thread atual (time.thread_time), que é o que o
+    documento consome de fato, esteja ele num processo do pool ou numa
+    thread junto com outros downloads. Ao contrário de limite_tempo, não
+    interrompe nada: quem processa consulta esgotado() entre páginas e
+    etapas e devolve o que já tem.
+    """
+
+    def __init__(self, segundos: Optional[float]):
+        self.segundos = segundos
+        self.inicio = time.thread_time()
+
+    def gasto(self) -> float:
+        return time.thread_time() - self.inicio
+
+    def esgotado(self) -> bool:
+        return bool(self.segundos) and self.gasto() > self.segundos
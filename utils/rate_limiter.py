@@ -0,0 +1,213 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class _BaldeHost:
+    """Estado do token bucket de um host"""
+
+    def __init__(self, taxa: float, capacidade: float):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.tokens = capacidade
+        self.ultimo_abastecimento = time.monotonic()
+        self.bloqueado_ate = 0.0
+        self.latencia_media = None
+        self.espera_total = 0.0
+        self.requisicoes = 0
+        self.throttles = 0
+
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter adaptativo por host (token bucket)
+
+    Cada host tem um balde que enche a `taxa` requisições/segundo até
+    `capacidade` tokens. A taxa se ajusta sozinha:
+    - 429/503: cai pela metade e respeita o Retry-After;
+    - latência bem acima da média ou falha de rede: cai 20%;
+    - respostas saudáveis: sobe aos poucos até a taxa máxima.
+    """
+
+    FATOR_THROTTLE = 0.5
+    FATOR_LATENCIA = 0.8
+    LIMIAR_LATENCIA = 2.0  # vezes a latência média
+    ALFA_LATENCIA = 0.2  # peso da média móvel exponencial
+
+    def __init__(
+            self,
+            taxa_inicial: float,
+            taxa_minima: float,
+            taxa_maxima: float,
+            capacidade: float = 1
+    ):
+        self.taxa_inicial = taxa_inicial
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        self.capacidade = capacidade
+        self.incremento = taxa_inicial * 0.1
+
+        self._baldes = {}
+        self._lock = threading.Lock()
+
+    def _balde(self, host: str) -> _BaldeHost:
+        if host not in self._baldes:
+            self._baldes[host] = _BaldeHost(self.taxa_inicial, self.capacidade)
+        return self._baldes[host]
+
+    @staticmethod
+    def _abastecer(balde: _BaldeHost, agora: float):
+        decorrido = agora - balde.ultimo_abastecimento
+        balde.tokens = min(balde.capacidade, balde.tokens + decorrido * balde.taxa)
+        balde.ultimo_abastecimento = agora
+
+    def aguardar(self, url: str) -> float:
+        """Bloqueia até haver token para o host da URL; retorna o tempo esperado"""
+        host = urlparse(url).netloc
+        esperado = 0.0
+
+        while True:
+            with self._lock:
+                balde = self._balde(host)
+                agora = time.monotonic()
+                self._abastecer(balde, agora)
+
+                if agora < balde.bloqueado_ate:
+                    espera = balde.bloqueado_ate - agora
+                elif balde.tokens >= 1:
+                    balde.tokens -= 1
+                    balde.requisicoes += 1
+                    balde.espera_total += esperado
+                    return esperado
+                else:
+                    espera = (1 - balde.tokens) / balde.taxa
+
+            time.sleep(espera)
+            esperado += espera
+
+    def registrar_resposta(
+            self,
+            url: str,
+            status: Optional[int],
+            latencia: float,
+            retry_after: Optional[str] = None
+    ):
+        """Ajusta a taxa do host conforme a resposta recebida"""
+        host = urlparse(url).netloc
+
+        with self._lock:
+            balde = self._balde(host)
+
+            if status in (429, 503):
+                balde.throttles += 1
+                balde.taxa = max(self.taxa_minima, balde.taxa * self.FATOR_THROTTLE)
+                balde.tokens = 0
+
+                segundos = self._interpretar_retry_after(retry_after)
+                if segundos:
+                    balde.bloqueado_ate = max(balde.bloqueado_ate, time.monotonic() + segundos)
+                return
+
+            if status is None:
+                # Falha de rede (timeout, conexão recusada): fora da média,
+                # que uma recusa imediata puxaria para baixo
+                balde.taxa = max(self.taxa_minima, balde.taxa * self.FATOR_LATENCIA)
+                return
+
+            if balde.latencia_media is None:
+                balde.latencia_media = latencia
+                return
+
+            if latencia > balde.latencia_media * self.LIMIAR_LATENCIA:
+                balde.taxa = max(self.taxa_minima, balde.taxa * self.FATOR_LATENCIA)
+            elif status is not None and status < 400:
+                balde.taxa = min(self.taxa_maxima, balde.taxa + self.incremento)
+
+            balde.latencia_media += self.ALFA_LATENCIA * (latencia - balde.latencia_media)
+
+    @staticmethod
+    def _interpretar_retry_after(valor: Optional[str]) -> Optional[float]:
+        """Retry-After pode vir em segundos ou como data HTTP"""
+        if not valor:
+            return None
+
+        try:
+            return max(0.0, float(valor))
+        except ValueError:
+            pass
+
+        try:
+            data = parsedate_to_datetime(valor)
+            return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def estatisticas(self) -> Dict:
+        """Taxa atual, espera acumulada e throttles por host"""
+        with self._lock:
+            return {
+                host: {
+                    'taxa_atual': round(balde.taxa, 3),
+                    'requisicoes': balde.requisicoes,
+                    'espera_total_s': round(balde.espera_total, 2),
+                    'espera_media_s': round(balde.espera_total / balde.requisicoes, 3)
+                    if balde.requisicoes else 0.0,
+                    'latencia_media_s': round(balde.latencia_media, 3)
+                    if balde.latencia_media is not None else None,
+                    'throttles': balde.throttles
+                }
+                for host, balde in self._baldes.items()
+            }
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter que passa toda requisição pelo rate limiter"""
+
+    def __init__(self, limiter: AdaptiveRateLimiter, *args, **kwargs):
+        self.limiter = limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        self.limiter.aguardar(request.url)
+
+        inicio = time.monotonic()
+        try:
+            response = super().send(request, *args, **kwargs)
+        except requests.RequestException:
+            # Falha de rede também conta como sinal de servidor lento
+            self.limiter.registrar_resposta(request.url, None, time.monotonic() - inicio)
+            raise
+
+        self.limiter.registrar_resposta(
+            request.url,
+            response.status_code,
+            time.monotonic() - inicio,
+            response.headers.get('Retry-After')
+        )
+        return response
+
+
+_limiter_compartilhado = None
+_lock_compartilhado = threading.Lock()
+
+
+def obter_rate_limiter(config) -> AdaptiveRateLimiter:
+    """Rate limiter único do processo, compartilhado por todos os componentes"""
+    global _limiter_compartilhado
+
+    with _lock_compartilhado:
+        if _limiter_compartilhado is None:
+            _limiter_compartilhado = AdaptiveRateLimiter(
+                taxa_inicial=1 / config.DELAY_BETWEEN_REQUESTS,
+                taxa_minima=config.RATE_LIMIT_MINIMO,
+                taxa_maxima=config.RATE_LIMIT_MAXIMO,
+                capacidade=config.RATE_LIMIT_RAJADA
+            )
+        return _limiter_compartilhado
+
@@ -5,6 +5,22 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from bs4 import BeautifulSoup
 
+from utils.html_parser import filtro_por_classe
+
+ELEMENTOS_CHAVE = [
+    ('article', 'tease'),
+    ('h2', 'entry-title'),
+    ('section', 'entry-content'),
+    ('div', 'meta-date')
+]
+
+# Filtro que preserva todos os elementos-chave (e suas subárvores), para
+# que as contagens de tags_importantes batam com as da página inteira
+FILTRO_ESTRUTURA = filtro_por_classe(
+    [tag for tag, _ in ELEMENTOS_CHAVE],
+    *[classe for _, classe in ELEMENTOS_CHAVE]
+)
+
 
 class StructureMonitor:
     """Monitora mudanças na estrutura HTML"""
@@ -20,14 +36,7 @@ class StructureMonitor:
             'ids_principais': set()
         }
 
-        elementos_chave = [
-            ('article', 'tease'),
-            ('h2', 'entry-title'),
-            ('section', 'entry-content'),
-            ('div', 'meta-date')
-        ]
-
-        for tag, classe in elementos_chave:
+        for tag, classe in ELEMENTOS_CHAVE:
             elementos = soup.find_all(tag, class_=classe)
             estrutura['tags_importantes'][f"{tag}.{classe}"] = len(elementos)
 